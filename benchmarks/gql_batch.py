@@ -0,0 +1,148 @@
+"""
+Metadata queries of SpeckleGQL against a local stand-in of the server GraphQL endpoint, which
+answers the aliased level, total count and object sub-queries with a fixed latency per request.
+
+Checks that execute_batch round trips the aliases and their prefixed variables, that the batched
+and the one by one calls give the same results, then times them along with the requests and
+connections each of them took:
+
+	python -m benchmarks.gql_batch --latency 20
+"""
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from source.client import SpeckleGQL
+
+PROJECT = 'aeb487f0e6'
+OBJECT = '0' * 32
+STORIES = range(-2, 8)
+COUNTS = {'Objects.BuiltElements.Wall': 120, 'Objects.BuiltElements.Column': 40, 'Objects.BuiltElements.Beam': 35}
+
+class StandIn(ThreadingHTTPServer):
+	"""
+	Answers POST /graphql like the server would, counts the requests and the connections.
+	"""
+
+	daemon_threads = True
+
+	def __init__(self, latency):
+		super().__init__(('127.0.0.1', 0), Handler)
+		self.latency = latency
+		self.requests = 0
+		self.connections = set()
+		self.counter = threading.Lock()
+
+	@property
+	def host(self):
+		return f'http://127.0.0.1:{self.server_address[1]}'
+
+	def reset(self):
+		self.requests = 0
+		self.connections = set()
+
+	def resolve(self, query, variables):
+		"""
+		Data of the composed document by aliases, an error if a variable is not declared or not given.
+		"""
+		header, _, body = query.partition('{')
+		declared = dict(re.findall(r'\$(\w+): ([^,)]+)', header))
+		used = set(re.findall(r'\$(\w+)', body))
+		# the nullable ones may be left out
+		missing = (used - set(declared)) | {name for name, type in declared.items() if type.endswith('!') and name not in variables}
+		if missing:
+			raise ValueError(f'Undeclared or missing variables: {sorted(missing)}')
+
+		data = {}
+		for alias in re.findall(r'^(\w+): project\(', body, re.M):
+			if variables[f'{alias}_projectId'] != PROJECT or variables[f'{alias}_objectId'] != OBJECT:
+				data[alias] = None
+			elif alias.startswith('level'):
+				idx = variables[f'{alias}_query'][0]['value']
+				objects = [{'data': {'level': {'id': f'level-{idx}', 'name': f'Level {idx}', 'index': idx, 'elevation': 3.0 * idx}}}] if idx in STORIES else []
+				data[alias] = {'object': {'children': {'totalCount': len(objects), 'objects': objects}}}
+			elif alias.startswith('count'):
+				condition = variables[f'{alias}_query'][0]
+				count = sum(COUNTS.values()) if condition['operator'] == '!=' else COUNTS.get(condition['value'], 0)
+				data[alias] = {'object': {'children': {'totalCount': count}}}
+			else:
+				data[alias] = {'object': {'id': OBJECT, 'data': {'id': OBJECT, 'speckle_type': 'Speckle.Core.Models.Collection'}}}
+		return data
+
+class Handler(BaseHTTPRequestHandler):
+
+	# keep-alive, as the server behind a load balancer
+	protocol_version = 'HTTP/1.1'
+	# the headers and the body are written apart, not to be held back until the client acks
+	disable_nagle_algorithm = True
+
+	def do_POST(self):
+		with self.server.counter:
+			self.server.requests += 1
+			self.server.connections.add(self.client_address)
+		payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+		time.sleep(self.server.latency)
+		try:
+			status, body = 200, {'data': self.server.resolve(payload['query'], payload['variables'])}
+		except Exception as e:
+			status, body = 400, {'errors': [{'message': str(e)}]}
+		content = json.dumps(body).encode()
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(content)))
+		self.end_headers()
+		self.wfile.write(content)
+
+	def log_message(self, *args):
+		pass
+
+def measure(server, call):
+	server.reset()
+	ts = time.perf_counter()
+	result = call()
+	return result, time.perf_counter() - ts, server.requests, len(server.connections)
+
+def run(latency):
+	server = StandIn(latency)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	gql = SpeckleGQL(server.host, 'token')
+	types = [None] + list(COUNTS)
+	try:
+		calls = {
+			'levels, one by one': lambda: {idx: gql.get_level_data(PROJECT, OBJECT, idx) for idx in STORIES},
+			'levels, batched': lambda: gql.get_levels_data(PROJECT, OBJECT, STORIES),
+			'counts, one by one': lambda: {speckle_type: gql.get_total_count(PROJECT, OBJECT, speckle_type) for speckle_type in types},
+			'counts, batched': lambda: gql.get_total_counts(PROJECT, OBJECT, types),
+			'object': lambda: gql.get_object_data(PROJECT, OBJECT),
+		}
+		results = {name: measure(server, call) for name, call in calls.items()}
+	finally:
+		gql.close()
+		server.shutdown()
+
+	levels = {idx: {'id': f'level-{idx}', 'name': f'Level {idx}', 'index': idx, 'elevation': 3.0 * idx} for idx in STORIES}
+	counts = {None: sum(COUNTS.values()), **COUNTS}
+	for name, (result, *_) in results.items():
+		if name.startswith('levels'):
+			assert result == levels, name
+		elif name.startswith('counts'):
+			assert result == counts, name
+	assert results['object'][0] == {'id': OBJECT, 'speckle_type': 'Speckle.Core.Models.Collection'}
+	return results
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('--latency', type=float, default=20, help='ms the stand-in takes per request')
+	arg = cmd.parse_args()
+
+	logging.disable(logging.INFO)
+	results = run(arg.latency / 1000)
+	print(f"{'call':<24}{'time, ms':>10}{'requests':>10}{'connections':>13}")
+	for name, (_, seconds, requests, connections) in results.items():
+		print(f"{name:<24}{seconds * 1e3:>10.1f}{requests:>10}{connections:>13}")
@@ -0,0 +1,65 @@
+"""
+Per-element cost of the serialization round trip the category mappers no longer take.
+
+Times the current mappers twice: on a copy of each element serialized with traverse_base and
+rebuilt with recompose_base, as the former mappers did on every call, and on the element in
+place. The former mappers themselves are not run, their own logic differs from the current one,
+so the gap is the cost of the round trip only, not the speedup over the former mapping.
+
+	python -m benchmarks.mapping -n 1000
+"""
+import argparse
+import logging
+import time
+
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+from source import TranslatorFactory
+from benchmarks.synthetic import SyntheticCommit
+
+def measure(count, loc='ua', seed=0):
+	commit = SyntheticCommit(count=count, loc=loc, seed=seed).generate()
+	translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=commit, loc=loc)
+	boundaries = translator.add_collection('Room Separation Lines', 'Revit Category')
+	commit['elements'].append(boundaries)
+	translator.collections['boundaries'] = len(commit['elements'])-1
+
+	results = {}
+	for collection in commit['elements'][:-1]:
+		category = collection.name.lower()
+		mapper = getattr(translator, 'map_' + category)
+		elements = collection['elements']
+
+		# the copies are mapped first, the elements themselves are still to be mapped in place
+		ts = time.perf_counter()
+		for element in elements:
+			bos = BaseObjectSerializer()
+			mapper(speckle_object=bos.recompose_base(bos.traverse_base(element)[1]))
+		round_trip = time.perf_counter() - ts
+
+		ts = time.perf_counter()
+		for element in elements:
+			mapper(speckle_object=element)
+		in_place = time.perf_counter() - ts
+
+		results[category] = {
+			'elements': len(elements),
+			'round_trip': round_trip / len(elements) * 1e6,
+			'in_place': in_place / len(elements) * 1e6,
+		}
+	return results
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-n', '--count', type=int, default=1000, help='walls, columns and beams to generate')
+	cmd.add_argument('-l', '--localization', default='ua', help='ac localization')
+	arg = cmd.parse_args()
+
+	logging.disable(logging.WARNING)
+	results = measure(arg.count, arg.localization)
+
+	print(f"{'category':<10}{'elements':>10}{'round trip, us':>16}{'in place, us':>14}{'ratio':>8}")
+	for category, result in results.items():
+		ratio = result['round_trip'] / result['in_place'] if result['in_place'] else 0
+		print(f"{category:<10}{result['elements']:>10}{result['round_trip']:>16.1f}{result['in_place']:>14.1f}{ratio:>7.1f}x")
@@ -0,0 +1,83 @@
+"""
+Curved segments per second of the slab/roof outline rebuild.
+
+Compares TranslatorArchicad2Revit.map_outline against the rebuild the slab and roof mappers used
+to do per segment, a new plane and points serialized with traverse_base each time. Both end up
+with the same serialized outlines, the serialization of the outlines is timed along.
+
+	python -m benchmarks.outline -n 400 -r 5
+"""
+import argparse
+import logging
+import time
+
+from specklepy.objects.geometry import Plane
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+from source import TranslatorFactory
+from source.view import View
+
+from .synthetic import SyntheticCommit
+
+def shells(count, seed=0):
+	"""
+	Freshly generated slabs and roofs, with the number of their curved segments.
+	"""
+	commit = SyntheticCommit(count=count, seed=seed).generate()
+	elements = [element for collection in commit.elements if collection.name in ('Slab', 'Roof') for element in collection.elements]
+	curved = sum(1 for element in elements for segment in element.outline.segments if getattr(segment, 'plane', None))
+	return commit, elements, curved
+
+def per_segment(translator, element):
+	segments = element['outline']['segments']
+	for i in range(0, len(segments)):
+		if 'plane' in segments[i]:
+			segment = segments[i]
+			plane = BaseObjectSerializer().traverse_base(Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3]))[1]
+			start = translator.add_point(segment['startPoint']['x']*1000, segment['startPoint']['y']*1000, segment['startPoint']['z']*1000, units='mm', traverse=True)
+			mid = translator.add_point(segment['midPoint']['x']*1000, segment['midPoint']['y']*1000, segment['midPoint']['z']*1000, units='mm', traverse=True)
+			end = translator.add_point(segment['endPoint']['x']*1000, segment['endPoint']['y']*1000, segment['endPoint']['z']*1000, units='mm', traverse=True)
+			overrides = {'plane': plane, 'startPoint': start, 'midPoint': mid, 'endPoint': end, 'angleRadians': segment['angleRadians']}
+			segments[i] = translator.override_schema(segment, translator.plans['floor_segment_curved'], overrides)
+
+def map_outline(translator, element):
+	translator.map_outline(element)
+
+def rebuild(convert, count):
+	"""
+	Seconds of the conversion over all the outlines of the generated commit, along with their
+	serialization, which the rebuilt objects are left to, and the serialized outlines.
+	"""
+	commit, elements, _ = shells(count)
+	translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=commit, loc='ua')
+	elements = [View.of(element) for element in elements]
+	ts = time.perf_counter()
+	for element in elements:
+		convert(translator, element)
+	outlines = [BaseObjectSerializer().traverse_base(element.target['outline'])[1] for element in elements]
+	return time.perf_counter() - ts, outlines
+
+def measure(count, repeat):
+	_, _, curved = shells(count)
+	assert rebuild(per_segment, count)[1] == rebuild(map_outline, count)[1]
+
+	results = {}
+	for name, convert in (('per_segment', per_segment), ('map_outline', map_outline)):
+		best = min(rebuild(convert, count)[0] for _ in range(repeat))
+		results[name] = curved / best
+	return curved, results
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-n', '--count', type=int, default=400, help='elements to generate, a slab and a roof per each fourth one')
+	cmd.add_argument('-r', '--repeat', type=int, default=5, help='runs to take the best of')
+	arg = cmd.parse_args()
+
+	logging.disable(logging.INFO)
+	curved, results = measure(arg.count, arg.repeat)
+	print(f"{curved} curved segments")
+	print(f"{'rebuild':<14}{'segments/s':>12}")
+	for name, rate in results.items():
+		print(f"{name:<14}{rate:>12.0f}")
+	print(f"speedup {results['map_outline'] / results['per_segment']:.1f}x")
@@ -0,0 +1,58 @@
+"""
+Edges per second of the polyline to segments conversion.
+
+Compares Translator.add_polyline against the add_line(..., traverse=True) per edge the shaft
+outlines used to be built with, both end up with the same serialized lines.
+
+	python -m benchmarks.polyline -e 100 -r 2000
+"""
+import argparse
+import random
+import time
+
+from source import TranslatorArchicad2Revit
+
+def polygon(edges, seed=0):
+	rnd = random.Random(seed)
+	coords = []
+	for _ in range(edges):
+		coords += [rnd.uniform(-50, 50), rnd.uniform(-50, 50), 3.0]
+	return coords + coords[:3]
+
+def per_edge(translator, coords):
+	lines = []
+	for i in range(0, len(coords) // 3 - 2):
+		sidx = i * 3
+		eidx = (i + 1) * 3
+		lines.append(translator.add_line(
+			coords[sidx], coords[sidx+1], coords[sidx+2],
+			coords[eidx], coords[eidx+1], coords[eidx+2], traverse=True))
+	lines.append(translator.add_line(coords[-6], coords[-5], coords[-4], coords[0], coords[1], coords[2], traverse=True))
+	return lines
+
+def measure(edges, repeat):
+	# the converters do not touch the translator state, no commit object is needed
+	translator = TranslatorArchicad2Revit.__new__(TranslatorArchicad2Revit)
+	coords = polygon(edges)
+	assert per_edge(translator, coords) == translator.add_polyline(coords)
+
+	results = {}
+	for name, convert in (('add_line', per_edge), ('add_polyline', lambda _, coords: translator.add_polyline(coords))):
+		ts = time.perf_counter()
+		for _ in range(repeat):
+			convert(translator, coords)
+		results[name] = edges * repeat / (time.perf_counter() - ts)
+	return results
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-e', '--edges', type=int, default=100, help='edges of the polygon')
+	cmd.add_argument('-r', '--repeat', type=int, default=2000, help='conversions to time')
+	arg = cmd.parse_args()
+
+	results = measure(arg.edges, arg.repeat)
+	print(f"{'converter':<14}{'edges/s':>12}")
+	for name, rate in results.items():
+		print(f"{name:<14}{rate:>12.0f}")
+	print(f"speedup {results['add_polyline'] / results['add_line']:.1f}x")
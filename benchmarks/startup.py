@@ -0,0 +1,72 @@
+"""
+Startup cost of the CLI and of the package, from python -X importtime.
+
+Each command runs in a fresh interpreter, the best of the repeats is taken:
+
+	help		run.py --help
+	package		import source
+	translator	source.TranslatorArchicad2Revit, what a translation imports
+	client		source.SpeckleWrapper, what a server round trip imports
+
+	python -m benchmarks.startup -r 5 --top 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+	'help': ['run.py', '--help'],
+	'package': ['-c', 'import source'],
+	'translator': ['-c', 'import source; source.TranslatorArchicad2Revit'],
+	'client': ['-c', 'import source; source.SpeckleWrapper'],
+}
+
+def parse(output):
+	"""
+	(module, self us, cumulative us, depth) of the importtime lines.
+	"""
+	imports = []
+	for line in output.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		own, cumulative, name = line[len('import time:'):].split('|')
+		depth = (len(name) - len(name.lstrip()) - 1) // 2
+		imports.append((name.strip(), int(own), int(cumulative), depth))
+	return imports
+
+def measure(command, repeat):
+	"""
+	Best wall time (s) of the interpreter run and the importtime lines of the fastest one.
+	"""
+	best = None
+	for _ in range(repeat):
+		ts = time.perf_counter()
+		result = subprocess.run([sys.executable, '-X', 'importtime', *command], cwd=ROOT, capture_output=True, text=True, check=True)
+		elapsed = time.perf_counter() - ts
+		if best is None or elapsed < best[0]:
+			best = (elapsed, parse(result.stderr))
+	return best
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-r', '--repeat', type=int, default=5, help='runs of each command')
+	cmd.add_argument('--top', type=int, default=0, help='heaviest top-level imports of run.py --help to list')
+	arg = cmd.parse_args()
+
+	results = {name: measure(command, arg.repeat) for name, command in COMMANDS.items()}
+
+	print(f"{'command':<12}{'wall, ms':>10}{'imports, ms':>13}{'modules':>9}")
+	for name, (elapsed, imports) in results.items():
+		total = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+		print(f"{name:<12}{elapsed * 1e3:>10.0f}{total / 1e3:>13.1f}{len(imports):>9}")
+
+	if arg.top:
+		print(f"\n{'run.py --help imports':<40}{'ms':>8}")
+		top = sorted((item for item in results['help'][1] if item[3] == 0), key=lambda item: -item[2])
+		for module, _, cumulative, _ in top[:arg.top]:
+			print(f"{module:<40}{cumulative / 1e3:>8.1f}")
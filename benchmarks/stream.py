@@ -0,0 +1,85 @@
+"""
+Peak memory of the in-memory translation against the streamed one.
+
+A synthetic commit is written into an on-disk object cache first, then each mode runs in its own
+process, so their peak RSS is not affected by the generator or by each other:
+
+	memory	operations.receive, TranslatorArchicad2Revit.map and serialization into the cache
+	stream	TranslationStream from the cache into the cache, a window of elements at once
+
+	python -m benchmarks.stream -n 20000 -w 100
+"""
+import argparse
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from specklepy.api import operations
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+from source import ObjectCache, TranslationStream, TranslatorFactory
+from benchmarks.synthetic import SyntheticCommit
+
+def peak_rss():
+	# kilobytes on linux
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def generate(path, count, loc):
+	cache = ObjectCache(path, max_size_mb=1e6)
+	root = SyntheticCommit(count=count, loc=loc).write(cache)
+	cache.close()
+	return root
+
+def translate(path, root, mode, loc, window):
+	cache = ObjectCache(path, max_size_mb=1e6)
+	ts = time.perf_counter()
+	if mode == 'memory':
+		speckle_object = operations.receive(root, local_transport=cache)
+		translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=speckle_object, loc=loc)
+		translator.map()
+		result, _ = BaseObjectSerializer(write_transports=[cache]).write_json(speckle_object)
+	else:
+		result = TranslationStream(cache, cache, window=window).run(root, 'Archicad2Revit', loc=loc)
+	elapsed = time.perf_counter() - ts
+	cache.close()
+	return result, elapsed
+
+def child(*args):
+	output = subprocess.run([sys.executable, '-m', 'benchmarks.stream', *map(str, args)], check=True, capture_output=True, text=True)
+	return output.stdout.split()
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-n', '--count', type=int, default=20000, help='walls, columns and beams to generate')
+	cmd.add_argument('-w', '--window', type=int, default=100, help='elements in flight of the stream mode')
+	cmd.add_argument('-l', '--localization', default='ua', help='ac localization')
+	cmd.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+	arg = cmd.parse_args()
+
+	logging.disable(logging.WARNING)
+
+	if arg.child:
+		if arg.child[0] == 'generate':
+			root = generate(arg.child[1], arg.count, arg.localization)
+			print(root, 0, peak_rss())
+		else:
+			path, root, mode = arg.child
+			result, elapsed = translate(path, root, mode, arg.localization, arg.window)
+			print(result, elapsed, peak_rss())
+		sys.exit()
+
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'objects.db')
+		common = ['-n', arg.count, '-w', arg.window, '-l', arg.localization]
+		root, _, generated = child(*common, '--child', 'generate', path)
+		print(f'synthetic commit {root}: {arg.count} walls/columns/beams, {os.path.getsize(path) / 1e6:.1f} MB on disk, generated with {float(generated):.0f} MB peak RSS')
+
+		print(f"{'mode':<10}{'peak RSS, MB':>14}{'time, s':>10}  result")
+		for mode in ('memory', 'stream'):
+			result, elapsed, rss = child(*common, '--child', path, root, mode)
+			print(f"{mode:<10}{float(rss):>14.0f}{float(elapsed):>10.2f}  {result}")
@@ -0,0 +1,171 @@
+"""
+Timings of the translation stages on a synthetic commit, fully offline.
+
+The commit is generated into a local object cache, then each stage is timed in isolation
+(the best of the repeats) and the whole translation end to end:
+
+	write		generated commit serialized into the local transport
+	receive		operations.receive from the local transport
+	map_*		category mapper per element, nested doors and windows with their host context
+	map		TranslatorArchicad2Revit.map over the received commit
+	serialize	translated commit serialized into a memory transport
+	total		receive, map and serialize
+
+Results are printed and written as json. Given a baseline (the json of a previous run),
+the stages slower than it by more than the tolerance are flagged and the exit status is 1.
+
+	python -m benchmarks.suite -n 1000 -o results.json
+	python -m benchmarks.suite -n 1000 -b results.json -t 0.1
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from specklepy.api import operations
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.memory import MemoryTransport
+
+from source import ObjectCache, TranslatorFactory
+from benchmarks.synthetic import SyntheticCommit
+
+def timed(call, *args, **kwargs):
+	ts = time.perf_counter()
+	result = call(*args, **kwargs)
+	return result, time.perf_counter() - ts
+
+def get_translator(commit, loc):
+	translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=commit, loc=loc)
+	boundaries = translator.add_collection('Room Separation Lines', 'Revit Category')
+	commit['elements'].append(boundaries)
+	translator.collections['boundaries'] = len(commit['elements'])-1
+	return translator
+
+def measure_mappers(commit, loc):
+	"""
+	Seconds and elements per each map_* stage, for a freshly received commit.
+	"""
+	translator = get_translator(commit, loc)
+	stages = {}
+
+	def add(stage, seconds, elements):
+		total = stages.setdefault(stage, [0.0, 0])
+		total[0] += seconds
+		total[1] += elements
+
+	for collection in commit['elements'][:-1]:
+		elements = collection['elements']
+		for category, indices in translator.group(collection.name, elements).items():
+			mapper = translator.mappers[category]
+			for element in (elements[i] for i in indices):
+				nested = getattr(element, 'elements', None) or []
+				host = translator.get_host(category, element) if nested else {}
+				_, seconds = timed(mapper, speckle_object=element)
+				add('map_' + category, seconds, 1)
+				for child in nested:
+					child_category = translator.route(child)
+					if child_category:
+						_, seconds = timed(translator.mappers[child_category], speckle_object=child, **host)
+						add('map_' + child_category, seconds, 1)
+	return stages
+
+def measure(count, loc='ua', seed=0, repeat=3):
+	"""
+	Best seconds of each stage over the repeats, with the number of elements it handled.
+	"""
+	best = {}
+
+	def keep(stage, seconds, elements=None):
+		if stage not in best or seconds < best[stage]['seconds']:
+			best[stage] = {'seconds': seconds, 'elements': elements}
+
+	with tempfile.TemporaryDirectory() as directory:
+		for i in range(repeat):
+			# a cache of its own each time, so the write is not skipped for the existing objects
+			cache = ObjectCache(os.path.join(directory, f'objects-{i}.db'), max_size_mb=1e6)
+			generator = SyntheticCommit(count=count, loc=loc, seed=seed)
+			root, seconds = timed(generator.write, cache)
+			keep('write', seconds, generator.counter)
+
+			commit = operations.receive(root, local_transport=cache)
+			for stage, (seconds, elements) in measure_mappers(commit, loc).items():
+				keep(stage, seconds, elements)
+
+			commit, receive = timed(operations.receive, root, local_transport=cache)
+			translator = get_translator(commit, loc)
+			_, mapping = timed(translator.map)
+			_, serialize = timed(BaseObjectSerializer(write_transports=[MemoryTransport()]).write_json, commit)
+			keep('receive', receive, generator.counter)
+			keep('map', mapping, generator.counter)
+			keep('serialize', serialize, generator.counter)
+			keep('total', receive + mapping + serialize, generator.counter)
+			cache.close()
+	return best
+
+def compare(results, baseline, tolerance, floor=0.001):
+	"""
+	Relative change of each stage against the baseline, and the stages regressed beyond the tolerance.
+	Stages faster than the floor (seconds) are not flagged, their timings are mostly noise.
+	"""
+	changes = {}
+	regressions = []
+	for stage, result in results.items():
+		before = baseline.get(stage)
+		if not before or not before['seconds']:
+			continue
+		changes[stage] = result['seconds'] / before['seconds'] - 1
+		if changes[stage] > tolerance and result['seconds'] >= floor:
+			regressions.append(stage)
+	return changes, regressions
+
+if __name__ == "__main__":
+
+	cmd = argparse.ArgumentParser()
+	cmd.add_argument('-n', '--count', type=int, default=1000, help='walls, columns and beams to generate')
+	cmd.add_argument('-l', '--localization', default='ua', help='ac localization')
+	cmd.add_argument('-s', '--seed', type=int, default=0, help='seed of the generator')
+	cmd.add_argument('-r', '--repeat', type=int, default=3, help='runs to take the best timings of')
+	cmd.add_argument('-o', '--output', metavar='PATH', help='json of the results')
+	cmd.add_argument('-b', '--baseline', metavar='PATH', help='json of a previous run to compare with')
+	cmd.add_argument('-t', '--tolerance', type=float, default=0.1, help='slowdown flagged as a regression, 0.1 for 10%%')
+	cmd.add_argument('-f', '--floor', type=float, default=0.001, help='seconds, faster stages are not flagged')
+	arg = cmd.parse_args()
+
+	logging.disable(logging.WARNING)
+	stages = measure(arg.count, arg.localization, arg.seed, arg.repeat)
+	results = {
+		'count': arg.count,
+		'localization': arg.localization,
+		'seed': arg.seed,
+		'repeat': arg.repeat,
+		'python': platform.python_version(),
+		'stages': stages,
+	}
+
+	changes, regressions = {}, []
+	if arg.baseline:
+		with open(arg.baseline, encoding='utf-8') as file:
+			baseline = json.load(file)
+		if (baseline.get('count'), baseline.get('localization'), baseline.get('seed')) != (arg.count, arg.localization, arg.seed):
+			print(f"baseline of another commit: -n {baseline.get('count')} -l {baseline.get('localization')} -s {baseline.get('seed')}", file=sys.stderr)
+		changes, regressions = compare(stages, baseline['stages'], arg.tolerance, arg.floor)
+		results['baseline'] = arg.baseline
+		results['changes'] = changes
+		results['regressions'] = regressions
+
+	print(f"{'stage':<18}{'elements':>10}{'time, ms':>12}{'per element, us':>18}{'change':>10}")
+	for stage, result in stages.items():
+		per_element = result['seconds'] / result['elements'] * 1e6 if result['elements'] else 0
+		change = f"{changes[stage]:+.1%}" if stage in changes else ''
+		flag = '  regression' if stage in regressions else ''
+		print(f"{stage:<18}{result['elements'] or 0:>10}{result['seconds'] * 1e3:>12.1f}{per_element:>18.1f}{change:>10}{flag}")
+
+	if arg.output:
+		with open(arg.output, 'w', encoding='utf-8') as file:
+			json.dump(results, file, indent=1)
+	if regressions:
+		sys.exit(1)
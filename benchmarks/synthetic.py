@@ -0,0 +1,270 @@
+import math
+import random
+
+from specklepy.objects.base import Base
+from specklepy.objects.geometry import Arc, Line, Plane, Point, Polycurve, Polyline
+from specklepy.objects.other import Collection
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+
+from source.translator import LOC
+
+SPECKLE_TYPES = {
+	'beam': 'Objects.BuiltElements.Beam:Objects.BuiltElements.Archicad.ArchicadBeam',
+	'beam_segment': 'Objects.BuiltElements.Archicad.ArchicadBeamSegment',
+	'column': 'Objects.BuiltElements.Column:Objects.BuiltElements.Archicad.ArchicadColumn',
+	'column_segment': 'Objects.BuiltElements.Archicad.ArchicadColumnSegment',
+	'door': 'Objects.BuiltElements.Archicad.ArchicadFenestration:Objects.BuiltElements.Archicad.ArchicadDoorWindowBase:Objects.BuiltElements.Archicad.ArchicadDoor',
+	'level': 'Objects.BuiltElements.Level:Objects.BuiltElements.Archicad.ArchicadLevel',
+	'opening': 'Objects.BuiltElements.Opening:Objects.BuiltElements.Archicad.ArchicadOpening',
+	'roof': 'Objects.BuiltElements.Roof:Objects.BuiltElements.Archicad.ArchicadShellBase:Objects.BuiltElements.Archicad.ArchicadRoof',
+	'slab': 'Objects.BuiltElements.Floor:Objects.BuiltElements.Archicad.ArchicadFloor',
+	'wall': 'Objects.BuiltElements.Wall:Objects.BuiltElements.Archicad.ArchicadWall',
+	'window': 'Objects.BuiltElements.Archicad.ArchicadFenestration:Objects.BuiltElements.Archicad.ArchicadDoorWindowBase:Objects.BuiltElements.Archicad.ArchicadWindow',
+	'zone': 'Objects.BuiltElements.Room:Objects.BuiltElements.Archicad.ArchicadRoom',
+}
+
+class SyntheticCommit():
+	"""
+	Generates Archicad-like commit objects, the way they come from operations.receive.
+	"""
+
+	def __init__(self, count=100, loc='ua', stories=4, seed=0):
+		self.count = count
+		self.loc = loc
+		self.stories = stories
+		self.random = random.Random(seed)
+		self.counter = 0
+		self.levels = []
+		# receive deduplicates equal sub-objects, so some of them are shared between elements
+		self.shared = Base()
+
+	def local(self, key):
+		return LOC[key][self.loc]
+
+	def point(self, x, y, z, units='m'):
+		point = Point.from_list([x, y, z])
+		point.units = units
+		return point
+
+	def line(self, start, end, z):
+		line = Line(start=self.point(start[0], start[1], z), end=self.point(end[0], end[1], z))
+		line.units = 'm'
+		return line
+
+	def arc(self, start, end, z):
+		arc = Arc()
+		arc.units = 'm'
+		arc.plane = Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3])
+		arc.startPoint = self.point(start[0], start[1], z)
+		arc.midPoint = self.point((start[0] + end[0]) / 2 + 0.5, (start[1] + end[1]) / 2 + 0.5, z)
+		arc.endPoint = self.point(end[0], end[1], z)
+		arc.angleRadians = 0.5
+		return arc
+
+	def polycurve(self, segments):
+		polycurve = Polycurve()
+		polycurve.units = 'm'
+		polycurve.closed = True
+		polycurve.segments = segments
+		return polycurve
+
+	def properties(self, groups=None, general=None):
+		properties = Base()
+		properties[self.local('general_parameters')] = dict({self.local('element_id'): f'ID-{self.counter}'}, **(general or {}))
+		properties['ІНФОРМАЦІЯ ПРО БУДИНОК'] = {
+			'RLL-Частина будівлі': self.random.choice(['A', 'B']),
+			'spk_prop_discipline': 'AR'
+		}
+		for key, value in (groups or {}).items():
+			properties[key] = value
+		return properties
+
+	def element(self, category, element_type, level):
+		self.counter += 1
+		element = Base.of_type(SPECKLE_TYPES[category])
+		element.id = f'{self.counter:032x}'
+		element.applicationId = f'{category}-{self.counter}'
+		element.units = 'm'
+		element['elementType'] = element_type
+		element['level'] = level
+		return element
+
+	def material(self, element):
+		element['structure'] = self.random.choice(['Basic', 'Composite', 'Profile'])
+		element['buildingMaterialName'] = 'Concrete'
+		element['compositeName'] = 'Composite'
+		element['profileName'] = 'Profile'
+		element['thickness'] = round(self.random.uniform(0.1, 0.4), 3)
+
+	def top_link(self):
+		return self.random.choice(['Home + 1 (Level)', 'Not linked'])
+
+	def outline(self, level):
+		x, y = self.random.uniform(-50, 50), self.random.uniform(-50, 50)
+		return [(x, y), (x + 10, y), (x + 10, y + 10), (x, y + 10)]
+
+	def wall(self, level):
+		wall = self.element('wall', 'Стіна', level)
+		self.material(wall)
+		sx, sy = self.random.uniform(-50, 50), self.random.uniform(-50, 50)
+		angle = self.random.uniform(0, 2 * math.pi)
+		length = self.random.uniform(1, 10)
+		ex, ey = sx + length * math.cos(angle), sy + length * math.sin(angle)
+		wall['baseLine'] = self.line((sx, sy), (ex, ey), level.elevation)
+		wall['baseLine'].length = length
+		wall['offsetFromOutside'] = self.random.choice([0, 0.05, None])
+		wall['flipped'] = self.random.random() < 0.5
+		wall['layer'] = 'Walls'
+		wall['topOffset'] = 0.0
+		wall['referenceLineLocation'] = self.random.choice(['Center', 'Core Center', 'Outside', 'Inside', 'Core Outside', 'Core Inside'])
+		curved = self.random.random() < 0.2
+		wall['arcAngle'] = self.random.uniform(0.2, 1.5) if curved else 0
+		wall['elementProperties'] = self.properties(general={self.local('top_link_story'): self.top_link()})
+		wall['elements'] = []
+		for i in range(self.random.randint(0, 3)):
+			wall['elements'].append(self.wido(level, length))
+		return wall
+
+	def wido(self, level, length):
+		door = self.random.random() < 0.5
+		wido = self.element('door' if door else 'window', 'Двері' if door else 'Вікно', level)
+		wido['libraryPart'] = 'Door 23' if door else 'Window 23'
+		wido['width'] = 0.9
+		wido['height'] = 2.1
+		wido['revealDepthFromSide'] = 0.1
+		wido['objLoc'] = self.random.uniform(0, length)
+		wido['lower'] = 0.0
+		wido['elementProperties'] = self.properties({'ЗАПОВНЕННЯ ВІКОННИХ ОТВОРІВ': {'Орієнтація віконного заповнення': 'L'}})
+		return wido
+
+	def column(self, level):
+		column = self.element('column', 'Колона', level)
+		column['segments'] = {'Segment #1': Base.of_type(SPECKLE_TYPES['column_segment'], assemblySegmentData=Base(
+			nominalWidth=0.4,
+			nominalHeight=0.5,
+			modelElemStructureType=self.random.choice(['Complex Profile', 'Basic']),
+			profileAttrName='HEA',
+			buildingMaterial='Concrete'
+		))}
+		column['bottomOffset'] = 0.0
+		column['height'] = 3.0
+		column['topOffset'] = 0.0
+		column['slantDirectionAngle'] = 0.0
+		column['elementProperties'] = self.properties(general={self.local('top_link_story'): self.top_link()})
+		return column
+
+	def beam(self, level):
+		beam = self.element('beam', 'Балка', level)
+		segment = Base.of_type(SPECKLE_TYPES['beam_segment'], assemblySegmentData=Base(
+			buildingMaterial=self.random.choice(['Steel', '']),
+			profileAttrName='IPE'
+		))
+		if self.random.random() < 0.5:
+			segment['topMaterial'] = 'Paint'
+		beam['segments'] = {'Segment #1': segment}
+		beam['anchorPoint'] = self.random.randint(0, 8)
+		beam['offset'] = 0.0
+		beam['elementProperties'] = self.properties(general={
+			self.local('cross_section_width_bottom_start_cut'): 0.2,
+			self.local('cross_section_height_bottom_start_cut'): 0.4
+		})
+		return beam
+
+	def shell(self, category, level, corners):
+		shell = self.element(category, 'Перекриття' if category == 'slab' else 'Дах', level)
+		self.material(shell)
+		segments = []
+		for i in range(len(corners)):
+			start, end = corners[i], corners[(i + 1) % len(corners)]
+			if self.random.random() < 0.5:
+				segments.append(self.arc(start, end, level.elevation))
+			else:
+				segments.append(self.line(start, end, level.elevation))
+		shell['outline'] = self.polycurve(segments)
+		shell['elementProperties'] = self.properties(general={'Bottom Elevation To Home Story': 0.1})
+		if category == 'roof':
+			shell['parameters'] = self.shared
+		return shell
+
+	def zone(self, level, corners):
+		zone = self.element('zone', 'Зона', level)
+		segments = [self.line(corners[i], corners[(i + 1) % len(corners)], level.elevation) for i in range(len(corners))]
+		zone['outline'] = self.polycurve(segments)
+		zone['elementProperties'] = self.properties({
+			'ZONESUM': {'ЛОКАЦИЯ Квартира': 'K1', 'spk_prop_num': str(self.counter)},
+			'ЗОНИ': {
+				'spk_prop_gid': 'G',
+				'spk_prop_func': 'Living',
+				'spk_prop_coef': 1.0,
+				'spk_prop_flat': 50.0,
+				'spk_prop_total': 60.0,
+				'spk_prop_living': 30.0,
+				'spk_prop_type': 'T'
+			},
+		})
+		return zone
+
+	def opening(self, level, corners):
+		opening = self.element('opening', 'Отвір', level)
+		coords = []
+		for x, y in corners + corners[:1]:
+			coords += [x + 1, y + 1, level.elevation]
+		outline = Polyline()
+		outline.units = 'm'
+		outline.value = coords
+		outline.closed = True
+		opening['outline'] = outline
+		opening['elementProperties'] = self.properties({'ОТВОРИ': {'spk_opening_level': level.name}}, general={
+			self.local('bottom_elevation_home_story'): 0.0,
+			self.local('top_elevation_home_story'): 3.0,
+			self.local('bottom_elevation_project_zero'): level.elevation
+		})
+		return opening
+
+	def generate(self, levels=True):
+		"""
+		Builds the commit object: walls, columns and beams per each count,
+		slabs, roofs, zones and openings per each fourth one.
+		"""
+		for i in range(self.stories):
+			level = Base.of_type(SPECKLE_TYPES['level'], name=f'Level {i}', index=i, elevation=3.0 * i)
+			level.units = 'm'
+			self.levels.append(level)
+
+		collections = {name: [] for name in ('Wall', 'Column', 'Beam', 'Slab', 'Roof', 'Zone', 'Opening')}
+		for i in range(self.count):
+			level = self.random.choice(self.levels)
+			collections['Wall'].append(self.wall(level))
+			collections['Column'].append(self.column(level))
+			collections['Beam'].append(self.beam(level))
+			if i % 4 == 0:
+				corners = self.outline(level)
+				collections['Slab'].append(self.shell('slab', level, corners))
+				collections['Roof'].append(self.shell('roof', level, corners))
+				collections['Zone'].append(self.zone(level, corners))
+				collections['Opening'].append(self.opening(level, corners))
+
+		commit = Collection()
+		commit.name = 'Synthetic'
+		commit.collectionType = 'Model'
+		commit.elements = []
+		for name, elements in collections.items():
+			collection = Collection()
+			collection.name = name
+			collection.collectionType = 'Element Type'
+			collection.elements = elements
+			commit.elements.append(collection)
+		if levels:
+			collection = Collection()
+			collection.name = 'Levels'
+			collection.collectionType = 'Levels Type'
+			collection.elements = self.levels
+			commit['@levels'] = collection
+		return commit
+
+	def write(self, transport, levels=True):
+		"""
+		Generates the commit object into the given (local) transport, returns its id.
+		"""
+		root, _ = BaseObjectSerializer(write_transports=[transport]).write_json(self.generate(levels))
+		return root
@@ -1,9 +1,13 @@
 import argparse
+from contextlib import nullcontext
 from datetime import datetime
 import logging
 import time
 
-from source import *
+# the rest of the package is imported as it is used, see source/__init__.py
+import source as mapper
+from source import LogWrapper
+from source.profiling import PROFILER, profile
 
 class App():
 
@@ -17,21 +21,79 @@ class App():
 
 	def wrap(self, service, *args, **kwargs):
 		try:
-			wrapper = globals()[service.capitalize() + 'Wrapper']
+			wrapper = getattr(mapper, service.capitalize() + 'Wrapper')
 			wrapper_obj = wrapper(*args, **kwargs)
 			if wrapper_obj:
 				setattr(self, service, wrapper_obj)
 		except Exception as e:
 			raise e
 
-	def translate(self, translator, loc='en'):
-		categories = []
-		speckle_object = self.speckle.retrieve('aeb487f0e6', '12bb209f52')
-		a2r = TranslatorFactory.get(translator, client=self.speckle, speckle_object=speckle_object, loc=loc)
+	def translate(self, translator, loc='en', workers=1, chunk_size=None, previous=None, window=None, report=None, source=None, target=None,
+			stream='aeb487f0e6', commit='12bb209f52', categories=None, branch='test', message='discipline 1 exp'):
+		# the categories to translate, all of the schema if not given
+		parameters = {'categories': categories} if categories else {}
+		if window:
+			# the stream maps the window serially and has no previous translation to take elements from
+			if workers != 1 or chunk_size or previous:
+				raise ValueError('Streaming does not support workers, chunk_size or previous')
+			return self.translate_stream(translator, loc, window, report, source, target, stream, commit, branch, message, **parameters)
+		speckle_object = self.retrieve(source or commit, stream, local=bool(source))
+		# previous (source, translated) commits, unchanged elements are taken from there
+		if previous:
+			previous = tuple(self.retrieve(previous_commit, stream, local=bool(source)) for previous_commit in previous)
+		a2r = mapper.TranslatorFactory.get(translator, client=getattr(self, 'speckle', None), speckle_object=speckle_object, loc=loc, workers=workers, chunk_size=chunk_size, previous=previous, report=report, **parameters)
 
 		a2r.map()
 
-		self.speckle.publish(speckle_object, 'aeb487f0e6', 'test', 'discipline 1 exp')
+		return self.publish(speckle_object, target, stream=stream, branch=branch, message=message)
+
+	def translate_stream(self, translator, loc='en', window=100, report=None, source=None, target=None,
+			stream='aeb487f0e6', commit='12bb209f52', branch='test', message='discipline 1 exp', **parameters):
+		# the commit goes through the local object cache, only a window of elements is kept in memory
+		# the cache of the server commits is used by one job at a time
+		with self.speckle.lock if not source or not target else nullcontext():
+			if source:
+				cache, root = self.local.download(source)
+			else:
+				root = self.speckle.download(stream, commit)
+				cache = self.speckle.cache
+			output = self.local.sink(target) if target else cache
+			try:
+				translation = mapper.TranslationStream(cache, output, window=window)
+				translated = translation.run(root, translator, client=getattr(self, 'speckle', None), loc=loc, report=report, **parameters)
+
+				return self.publish(translated, target, transport=output, stream=stream, branch=branch, message=message)
+			finally:
+				# the local databases, the cache of the server commits is kept open
+				if source:
+					self.local.close(cache)
+				if target:
+					self.local.close(output)
+
+	def retrieve(self, commit, stream='aeb487f0e6', local=False):
+		# a local commit (see LocalWrapper) or a commit of the server project
+		if local:
+			return self.local.retrieve(commit)
+		return self.speckle.retrieve(stream, commit)
+
+	def publish(self, obj, target=None, transport=None, stream='aeb487f0e6', branch='test', message='discipline 1 exp'):
+		if target:
+			return self.local.publish(obj, target, transport=transport)
+		return self.speckle.publish(obj, stream, branch, message, transport=transport)
+
+	def run_job(self, job):
+		"""
+		Translates the commit of the job taken by JobRunner, returns the translated one.
+		"""
+		job = dict(job)
+		source, target = job.pop('input', None), job.pop('output', None)
+		try:
+			return self.translate(job.pop('translator', 'Archicad2Revit'), source=source, target=target, **job)
+		finally:
+			# nothing reads the memory commits of a job after it, the databases are closed already
+			for uri in (source, target):
+				if uri:
+					self.local.discard(uri)
 
 if __name__ == "__main__":
 
@@ -40,11 +102,43 @@ if __name__ == "__main__":
 	cmd = argparse.ArgumentParser()
 	cmd.add_argument('-p', '--port', required=False, help='archicad port')
 	cmd.add_argument('-t', '--translator', required=False, help='translator scheme')
-	cmd.add_argument('-l', '--localization', required=False, help='ac localization')
+	cmd.add_argument('-l', '--localization', required=False, help='ac localization: en (default) or ua')
+	cmd.add_argument('-w', '--workers', required=False, type=int, default=1, help='mapping processes, 1 to run serially')
+	cmd.add_argument('-c', '--chunk-size', required=False, type=int, help='elements per mapping task')
+	cmd.add_argument('-s', '--stream', required=False, type=int, metavar='WINDOW', help='stream elements through the local cache, WINDOW of them at once, serially and without a previous translation')
+	cmd.add_argument('-ps', '--previous-source', required=False, help='source commit of the previous translation')
+	cmd.add_argument('-pt', '--previous-target', required=False, help='translated commit of the previous translation')
+	cmd.add_argument('-r', '--report', required=False, metavar='PATH', help='json report of the translation issues')
+	cmd.add_argument('-i', '--input', required=False, metavar='COMMIT', help='local commit instead of the server one: json:PATH, sqlite:PATH#ID or memory:NAME')
+	cmd.add_argument('-o', '--output', required=False, metavar='COMMIT', help='local commit instead of publishing: json:PATH, sqlite:PATH or memory: to discard')
+	cmd.add_argument('--serve', required=False, metavar='SPOOL', help='run the json jobs put into the SPOOL directory, within this process')
+	cmd.add_argument('--jobs', required=False, type=int, default=2, help='jobs to run at once when serving')
+	cmd.add_argument('--once', action='store_true', help='stop serving when the spool is empty')
+	cmd.add_argument('--offline', action='store_true', help='serve local commits only, without connecting to the server')
+	cmd.add_argument('--stats', required=False, metavar='PATH', help='time, elements, allocations and peak RSS of the stages as json, and as a table in the log')
+	cmd.add_argument('--stats-memory', action='store_true', help='allocations of the stages as well (tracemalloc), several times slower')
+	cmd.add_argument('--profile', required=False, metavar='PATH', help='cProfile stats, or collapsed stacks for flame graphs if PATH ends with .collapsed')
+	cmd.add_argument('--log-json', action='store_true', help='log json lines instead of the colored text')
+	cmd.add_argument('--log-queue', action='store_true', help='write the log from a thread of its own')
 	arg = cmd.parse_args()
+	if arg.stream and (arg.workers != 1 or arg.chunk_size or arg.previous_source or arg.previous_target):
+		cmd.error('-s/--stream does not support -w/--workers, -c/--chunk-size or -ps/--previous-source and -pt/--previous-target')
+	LogWrapper.configure(json_output=arg.log_json, queued=arg.log_queue)
 
 	print (f"{datetime.now().strftime('%H:%M:%S')}:{int(datetime.now().microsecond/1000):03d} initializing...")
-	app = App(['speckle'])
-	app.translate('Archicad2Revit', arg.localization)
+	if arg.stats:
+		PROFILER.start(memory=arg.stats_memory)
+	with profile(arg.profile) if arg.profile else nullcontext():
+		# the server is only connected to if it is read from or published to
+		app = App(['local'] if (arg.input and arg.output) or arg.offline else ['local', 'speckle'])
+		if arg.serve:
+			# the client, the schemas and the caches stay set up between the jobs
+			mapper.JobRunner(arg.serve, app.run_job, concurrency=arg.jobs).serve(once=arg.once)
+		else:
+			previous = (arg.previous_source, arg.previous_target) if arg.previous_source and arg.previous_target else None
+			app.translate('Archicad2Revit', arg.localization, workers=arg.workers, chunk_size=arg.chunk_size, previous=previous, window=arg.stream, report=arg.report, source=arg.input, target=arg.output)
+	if arg.stats:
+		PROFILER.summary(app.log)
+		PROFILER.to_json(arg.stats)
 
 	print (f"{datetime.now().strftime('%H:%M:%S')}:{int(datetime.now().microsecond/1000):03d} completed in {round(time.time() - ts, 2)} sec")
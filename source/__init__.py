@@ -1,12 +1,58 @@
 # source/__init__.py
-# from .archicad import ArchicadWrapper
-from .logging import LogWrapper
-from .client import SpeckleWrapper, SpeckleGQL
-from .translator import TranslatorFactory, Translator, TranslatorArchicad2Revit
+# the modules are imported on the first access of their names (PEP 562): the client alone pulls in
+# specklepy, gql and requests, which neither --help nor an offline run needs
+import importlib
+
+from typing import TYPE_CHECKING
+
+_modules = {
+	# "ArchicadWrapper": "archicad",
+	"LogWrapper": "logging",
+	"ObjectCache": "cache",
+	"SchemaRegistry": "schema", "Schema": "schema",
+	"Diagnostics": "diagnostics",
+	"Profiler": "profiling", "StackSampler": "profiling",
+	"SpeckleWrapper": "client", "SpeckleGQL": "client", "SpeckleSender": "client",
+	"LocalWrapper": "local",
+	"TranslatorFactory": "translator", "Translator": "translator", "TranslatorArchicad2Revit": "translator",
+	"TranslationStream": "stream",
+	"JobRunner": "worker",
+}
 
 __all__ = [
 	# "ArchicadWrapper",
 	"LogWrapper",
-	"SpeckleWrapper","SpeckleGQL",
+	"ObjectCache",
+	"SchemaRegistry", "Schema",
+	"Diagnostics",
+	"Profiler", "StackSampler",
+	"SpeckleWrapper","SpeckleGQL","SpeckleSender",
+	"LocalWrapper",
 	"TranslatorFactory", "Translator", "TranslatorArchicad2Revit",
-]
\ No newline at end of file
+	"TranslationStream",
+	"JobRunner",
+]
+
+def __getattr__(name):
+	if name not in _modules:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module('.' + _modules[name], __name__), name)
+	# found as a plain attribute from now on
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
+
+if TYPE_CHECKING:
+	# from .archicad import ArchicadWrapper
+	from .logging import LogWrapper
+	from .cache import ObjectCache
+	from .schema import SchemaRegistry, Schema
+	from .diagnostics import Diagnostics
+	from .profiling import Profiler, StackSampler
+	from .client import SpeckleWrapper, SpeckleGQL, SpeckleSender
+	from .local import LocalWrapper
+	from .translator import TranslatorFactory, Translator, TranslatorArchicad2Revit
+	from .stream import TranslationStream
+	from .worker import JobRunner
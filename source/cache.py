@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import time
+
+from contextlib import closing
+
+from specklepy.core.helpers import speckle_path_provider
+from specklepy.transports.abstract_transport import AbstractTransport
+
+from .logging import LogWrapper
+
+class ObjectCache(AbstractTransport):
+	"""
+	On-disk content-addressed cache of the received objects, keyed by the speckle object id.
+
+	Passed to operations.receive as the local transport, so the server transport only fetches
+	the ids missing here. The total size is capped, the least recently used objects are evicted
+	first, except the ones touched by the current receive (they are still to be deserialized).
+	"""
+
+	def __init__(self, path=None, max_size_mb=1024, name='ObjectCache'):
+		self.log = LogWrapper.get_logger('speckle.cache')
+		self._name = name
+		self.path = path or self.get_default_path()
+		self.max_size = int(max_size_mb * 1000 * 1000)
+		# objects are written in batches of this size, so large downloads are not buffered in memory
+		self.max_batch_size = 10 * 1000 * 1000
+		self.batch = []
+		self.batch_size = 0
+		self.touched = set()
+
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		# may be used by the threads of a long-running process, one at a time (see SpeckleWrapper.lock)
+		self.connection = sqlite3.connect(self.path, check_same_thread=False)
+		with closing(self.connection.cursor()) as c:
+			c.execute("""
+				CREATE TABLE IF NOT EXISTS objects(
+				  id TEXT PRIMARY KEY,
+				  content TEXT,
+				  size INTEGER,
+				  accessed REAL
+				) WITHOUT ROWID
+			""")
+			c.execute("CREATE INDEX IF NOT EXISTS objects_accessed ON objects(accessed)")
+			c.execute("PRAGMA journal_mode='wal'")
+			c.execute("PRAGMA synchronous=NORMAL")
+			self.connection.commit()
+
+		self.reset()
+
+	@property
+	def name(self):
+		return self._name
+
+	@staticmethod
+	def get_default_path():
+		return str(speckle_path_provider.user_application_data_path().joinpath('specklepy-mapper', 'objects.db'))
+
+	def reset(self):
+		"""
+		Starts a new session: zeroes the counters and protects everything touched from now on.
+		"""
+		self.session = time.time()
+		# ids served from the cache and the ones it had to be fetched, each counted once
+		self.hits = set()
+		self.misses = set()
+		self.saved = 0
+		self.evicted = 0
+
+	def get_size(self):
+		with closing(self.connection.cursor()) as c:
+			size, count = c.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM objects").fetchone()
+		return size, count
+
+	def get_object(self, id):
+		with closing(self.connection.cursor()) as c:
+			row = c.execute("SELECT content FROM objects WHERE id = ?", (id,)).fetchone()
+		if row:
+			self.count(id, True)
+			self.touched.add(id)
+			return row[0]
+		self.count(id, False)
+		return None
+
+	def has_objects(self, id_list):
+		found = self.find(id_list)
+		for id in id_list:
+			self.count(id, id in found)
+		self.touched.update(found)
+		return {id: id in found for id in id_list}
+
+	def count(self, id, hit):
+		if not hit:
+			self.misses.add(id)
+		elif id not in self.misses:
+			self.hits.add(id)
+
+	def find(self, id_list, chunk=500):
+		found = set()
+		with closing(self.connection.cursor()) as c:
+			for i in range(0, len(id_list), chunk):
+				ids = id_list[i:i+chunk]
+				rows = c.execute(f"SELECT id FROM objects WHERE id IN ({','.join('?' * len(ids))})", ids)
+				found.update(row[0] for row in rows)
+		return found
+
+	def is_complete(self, id):
+		"""
+		Whether the object and all of its children are cached. receive trusts the local root
+		and does not check its children, so a partly evicted tree must not be served.
+		"""
+		with closing(self.connection.cursor()) as c:
+			row = c.execute("SELECT content FROM objects WHERE id = ?", (id,)).fetchone()
+		if not row:
+			return False
+		children = list(json.loads(row[0]).get('__closure', {}))
+		if len(self.find(children)) == len(children):
+			return True
+		with closing(self.connection.cursor()) as c:
+			c.execute("DELETE FROM objects WHERE id = ?", (id,))
+			self.connection.commit()
+		return False
+
+	def begin_write(self):
+		self.batch = []
+		self.batch_size = 0
+
+	def save_object(self, id, serialized_object):
+		self.batch.append((id, serialized_object, len(serialized_object), time.time()))
+		self.batch_size += len(serialized_object)
+		self.saved += 1
+		if self.batch_size >= self.max_batch_size:
+			self.end_write()
+
+	def save_object_from_transport(self, id, source_transport):
+		self.save_object(id, source_transport.get_object(id))
+
+	def end_write(self):
+		with closing(self.connection.cursor()) as c:
+			c.executemany("INSERT OR REPLACE INTO objects(id, content, size, accessed) VALUES(?,?,?,?)", self.batch)
+			self.connection.commit()
+		self.batch = []
+		self.batch_size = 0
+
+	def copy_object_and_children(self, id, target_transport):
+		raise NotImplementedError
+
+	def flush(self):
+		"""
+		Stores the access time of the objects read so far and evicts the least recently used ones.
+		"""
+		now = time.time()
+		with closing(self.connection.cursor()) as c:
+			c.executemany("UPDATE objects SET accessed = ? WHERE id = ?", ((now, id) for id in self.touched))
+			self.connection.commit()
+		self.touched = set()
+		self.evict()
+
+	def evict(self):
+		size, count = self.get_size()
+		if size <= self.max_size:
+			return 0
+
+		evicted = []
+		with closing(self.connection.cursor()) as c:
+			rows = c.execute("SELECT id, size FROM objects WHERE accessed < ? ORDER BY accessed", (self.session,))
+			for id, object_size in rows:
+				if size <= self.max_size:
+					break
+				evicted.append((id,))
+				size -= object_size
+			c.executemany("DELETE FROM objects WHERE id = ?", evicted)
+			self.connection.commit()
+
+		self.evicted += len(evicted)
+		if size > self.max_size:
+			self.log.warning('Object cache is over the limit: $m(%.1f) of $m(%.1f) MB are used by the current receive', size/1e6, self.max_size/1e6)
+		return len(evicted)
+
+	def report(self):
+		size, count = self.get_size()
+		hits, misses = len(self.hits), len(self.misses)
+		ratio = hits / (hits + misses) * 100 if hits + misses else 0
+		self.log.info('Object cache: hits $m(%d), misses $m(%d) ($y(%.1f%%)), saved $m(%d), evicted $m(%d), size $m(%.1f) MB in $m(%d) objects', hits, misses, ratio, self.saved, self.evicted, size/1e6, count)
+
+	def close(self):
+		if self.connection:
+			self.connection.close()
+			self.connection = None
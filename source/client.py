@@ -1,21 +1,31 @@
+import gzip
 import json
 import logging
+import random
+import re
 import requests
+import threading
 import time
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from gql.transport.requests import log as gql_logger
+from requests.adapters import HTTPAdapter
 
 from specklepy.api.client import SpeckleClient
 from specklepy.api.credentials import get_default_account
 from specklepy.api import operations
+from specklepy.transports.memory import MemoryTransport
 from specklepy.transports.server import ServerTransport
 from specklepy.serialization.base_object_serializer import BaseObjectSerializer
 
+from .cache import ObjectCache
 from .logging import LogWrapper
+from .profiling import PROFILER
 
 class SpeckleWrapper():
 
-	def __init__(self, host="https://app.speckle.systems"):
+	def __init__(self, host="https://app.speckle.systems", cache=None, cache_size=1024):
 
 		self.log = LogWrapper.get_logger('speckle.client')
 		gql_logger.setLevel(self.log.getEffectiveLevel()+10) # skip requests body
@@ -25,108 +35,172 @@ class SpeckleWrapper():
 		self.token = None
 		self.transport = None
 		self.gql = None
+		self.sender = None
+		self.cache = ObjectCache(cache, cache_size) if cache is not False else None
+		# held while the cache is used, the wrapper may be shared by concurrent jobs (see JobRunner)
+		self.lock = threading.RLock()
 
 		self.connect();
 
 	def connect(self):
 
 		try:
-			client = SpeckleClient(self.host)
-			account = get_default_account()
-			client.authenticate_with_account(account)
+			with PROFILER.stage('connect'):
+				client = SpeckleClient(self.host)
+				account = get_default_account()
+				client.authenticate_with_account(account)
 			if account and client:
 				self.token = account.token
 				self.client = client
 				self.gql = SpeckleGQL(self.host, self.token)
-				self.log.info(f'Connected with credentials: $y({client.user.account.userInfo})')
+				self.sender = SpeckleSender(self.host, self.token)
+				self.log.info('Connected with credentials: $y(%s)', client.user.account.userInfo)
 		except Exception as e:
 			raise e
 
 	def retrieve(self, streamId, commitId):
 
-		self.log.info(f'Receiving referencedObject, streamId: $m({streamId}), commitId: $m({commitId})')
-		commit = self.client.commit.get(streamId, commitId)
-		transport = ServerTransport(client=self.client, stream_id=streamId)
-		if transport:
-			self.transport = transport
-			result = operations.receive(commit.referencedObject, self.transport)
+		self.log.info('Receiving referencedObject, streamId: $m(%s), commitId: $m(%s)', streamId, commitId)
+		with self.lock:
+			commit = self.client.commit.get(streamId, commitId)
+			transport = ServerTransport(client=self.client, stream_id=streamId)
+			if transport:
+				self.transport = transport
+				if self.cache:
+					self.cache.reset()
+					self.cache.is_complete(commit.referencedObject)
+				with PROFILER.stage('receive') as stage:
+					result = operations.receive(commit.referencedObject, self.transport, self.cache)
+					stage['elements'] = result.totalChildrenCount or 0
+				if self.cache:
+					self.cache.flush()
+					self.cache.report()
 
-		return result
+			return result
 
-	def publish(self, obj, projectId, branch, message, retries=10, delay=3):
+	def download(self, streamId, commitId):
+		"""
+		Copies the referenced object tree into the local cache, without deserializing it.
+		Returns the id of the commit object, e.g. for TranslationStream.
+		"""
+		self.log.info('Downloading referencedObject, streamId: $m(%s), commitId: $m(%s)', streamId, commitId)
+		with self.lock:
+			commit = self.client.commit.get(streamId, commitId)
+			self.transport = ServerTransport(client=self.client, stream_id=streamId)
+			self.cache.reset()
+			with PROFILER.stage('receive'):
+				if not self.cache.is_complete(commit.referencedObject):
+					self.transport.copy_object_and_children(commit.referencedObject, self.cache)
+			self.cache.flush()
+			self.cache.report()
+			return commit.referencedObject
 
-		self.log.info(f'Publishing commit, branch: $y("{branch}"), message: $y("{message}")...')
-		bos = BaseObjectSerializer()
-		base = obj
+	def publish(self, obj, projectId, branch, message, retries=10, delay=3, transport=None):
+		"""
+		Publishes the given object, or the id of the object tree already serialized into the transport.
+		"""
+		self.log.info('Publishing commit, branch: $y("%s"), message: $y("%s")...', branch, message)
+		def create(attempt):
+			return self.client.commit.create(
+			    projectId,
+			    obj_updated,
+			    branch_name = branch,
+			    message = message
+			)
 
-		for attempt in range(retries):
-			try:
-				obj_updated = operations.send(obj, [self.transport])
-				commit = self.client.commit.create(
-				    projectId,
-				    obj_updated,
-				    branch_name = branch,
-				    message = message
-				)
-				self.log.info(f'Published successfully')
-				return commit
-			except Exception as e:
-				self.log.error(f'Attempt $m({attempt + 1}) failed: {e}')
-				if attempt < retries - 1:
-					time.sleep(delay)
-				else:
-					raise
+		with PROFILER.stage('publish'):
+			# objects the server already has (e.g. unchanged elements) are not uploaded again
+			if transport:
+				obj_updated = self.sender.transfer(projectId, obj, transport, retries=retries, delay=delay)
+			else:
+				obj_updated = self.sender.send(projectId, obj, retries=retries, delay=delay)
+			commit = Backoff(retries, delay).run(create)
+		self.log.info('Published successfully')
+		return commit
 
 	def query(self, query, *args):
 		method = getattr(self.gql, query, None)
 		if callable(method):
 			return method(*args)
 		else:
-			self.log.error(f'Could not call such query: $y("{query}")')
+			self.log.error('Could not call such query: $y("%s")', query)
 
-class SpeckleGQL():
+class SpeckleQueries():
+	"""
+	GraphQL documents of the metadata queries and the parsing of their responses, apart from
+	the sending of the requests by SpeckleGQL.
+	"""
 
-	def __init__(self, host, token):
-		self.host = host
-		self.token = token
-		self.log = LogWrapper.get_logger('speckle.client.gql')
+	# sub-queries as (field, variable types), so they could be sent both alone and in batches
+	LEVEL = ("""
+		project(id: $projectId) {
+		  object(id: $objectId) {
+		    children(query: $query, select: $select, orderBy: $orderBy, depth: $depth, limit: $limit) {
+		      totalCount
+		      objects {
+		        data
+		      }
+		    }
+		  }
+		}
+	""", {'objectId': 'String!', 'projectId': 'String!', 'query': '[JSONObject!]', 'select': '[String]', 'orderBy': 'JSONObject', 'depth': 'Int!', 'limit': 'Int!'})
 
-	def execute(self, query, variables):
-	    """
-	    Sends a GraphQL query to the Speckle server and returns the response.
+	TOTAL_COUNT = ("""
+		project(id: $projectId) {
+		  object(id: $objectId) {
+		    children(query: $query, select: $select, orderBy: $orderBy) {
+		      totalCount
+		    }
+		  }
+		}
+	""", {'objectId': 'String!', 'projectId': 'String!', 'query': '[JSONObject!]', 'select': '[String]', 'orderBy': 'JSONObject'})
 
-	    Args:
-	        query (str): The GraphQL query.
-	        variables (dict, optional): The variables for the GraphQL query. Defaults to None.
+	OBJECT = ("""
+		project(id: $projectId) {
+		  object(id: $objectId) {
+		    id
+		    data
+		  }
+		}
+	""", {'objectId': 'String!', 'projectId': 'String!'})
 
-	    Returns:
-	        dict: The response data if the request is successful, None otherwise.
-	    """
-	    url = f"{self.host}/graphql"
-	    payload = {"query": query, "variables": variables}
-	    headers = {"Authorization": self.token, "Content-Type": "application/json"}
+	@property
+	def url(self):
+		return f"{self.host}/graphql"
 
-	    response = requests.post(url, json=payload, headers=headers)
-	    return response.json() if response.status_code == 200 else None
+	@property
+	def headers(self):
+		return {
+			"Authorization": self.token,
+			"Content-Type": "application/json",
+			"Accept-Encoding": "gzip, deflate"
+		}
 
-	def get_level_data(self, projectId, objectId, idx):
+	@staticmethod
+	def compose(name, operations):
 		"""
-		Hope this is temporary solution and we'll be able to fetch levels from info section.
-		"""
-		query = """
-			query Object($objectId: String!, $projectId: String!, $query: [JSONObject!], $select: [String], $orderBy: JSONObject, $depth: Int!, $limit: Int!) {
-			  project(id: $projectId) {
-			    object(id: $objectId) {
-			      children(query: $query, select: $select, orderBy: $orderBy, depth: $depth, limit: $limit) {
-			        totalCount
-			        objects {
-			          data
-			        }
-			      }
-			    }
-			  }
-			}
+		Builds a single GraphQL document from the aliased sub-queries.
+
+		Args:
+			name (str): The operation name.
+			operations (dict): Sub-queries as alias: (field, variable types, variables).
+				Variables are prefixed by the alias to stay unique within the document.
+
+		Returns:
+			tuple: The query and its variables.
 		"""
+		definitions = []
+		selections = []
+		values = {}
+		for alias, (field, types, variables) in operations.items():
+			definitions += [f'${alias}_{key}: {value}' for key, value in types.items()]
+			selections.append(f'{alias}: ' + re.sub(r'\$(\w+)', lambda m: f'${alias}_{m.group(1)}', field.strip()))
+			values.update({f'{alias}_{key}': value for key, value in variables.items()})
+
+		query = f"query {name}({', '.join(definitions)}) {{\n" + '\n'.join(selections) + '\n}'
+		return query, values
+
+	def level_operation(self, projectId, objectId, idx):
 		variables = {
 			"projectId": projectId,
 			"objectId": objectId,
@@ -149,25 +223,10 @@ class SpeckleGQL():
 			"depth": 3,
 			"limit": 1
 		}
+		return self.LEVEL + (variables,)
 
-		response = self.execute(query, variables)
-		result = response['data']['project']['object']['children']['objects']
-
-		return result[0]['data']['level'] if result else None
-
-	def get_total_count(self, projectId, objectId, speckle_type):
+	def total_count_operation(self, projectId, objectId, speckle_type):
 		operator = '!=' if speckle_type == None else '='
-		query = """
-			query Object($objectId: String!, $projectId: String!, $query: [JSONObject!], $select: [String], $orderBy: JSONObject) {
-			  project(id: $projectId) {
-			    object(id: $objectId) {
-			      children(query: $query, select: $select, orderBy: $orderBy) {
-			        totalCount
-			      }
-			    }
-			  }
-			}
-		"""
 		variables = {
 			"projectId": projectId,
 			"objectId": objectId,
@@ -182,27 +241,268 @@ class SpeckleGQL():
 				"speckle_type"
 			]
 		}
+		return self.TOTAL_COUNT + (variables,)
 
-		response = self.execute(query, variables)
-		result = response['data']['project']['object']['children']['totalCount']
-		return result
+	def levels_operations(self, projectId, objectId, indices):
+		return {f'level{n}': self.level_operation(projectId, objectId, idx) for n, idx in enumerate(indices)}
 
-	def get_object_data(self, projectId, objectId):
-		query = """
-			query Object($objectId: String!, $projectId: String!) {
-			  project(id: $projectId) {
-			    object(id: $objectId) {
-			      id
-			      data
-			    }
-			  }
-			}
-		"""
+	@staticmethod
+	def parse_levels(response, indices):
+		levels = {}
+		for n, idx in enumerate(indices):
+			result = response[f'level{n}']['object']['children']['objects']
+			levels[idx] = result[0]['data']['level'] if result else None
+		return levels
+
+	def total_counts_operations(self, projectId, objectId, speckle_types):
+		return {f'count{n}': self.total_count_operation(projectId, objectId, speckle_type) for n, speckle_type in enumerate(speckle_types)}
+
+	@staticmethod
+	def parse_total_counts(response, speckle_types):
+		return {speckle_type: response[f'count{n}']['object']['children']['totalCount'] for n, speckle_type in enumerate(speckle_types)}
+
+	def object_operation(self, projectId, objectId):
 		variables = {
 			"projectId": projectId,
 			"objectId": objectId
 		}
+		return self.OBJECT + (variables,)
+
+	@staticmethod
+	def parse_object(response):
+		return response['project']['object']['data']
+
+class SpeckleGQL(SpeckleQueries):
+
+	def __init__(self, host, token, timeout=(5, 60), pool_size=10):
+		self.host = host
+		self.token = token
+		self.timeout = timeout
+		self.log = LogWrapper.get_logger('speckle.client.gql')
+
+		# keep-alive session, reuses pooled connections between the queries
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+		self.session.mount('http://', adapter)
+		self.session.mount('https://', adapter)
+		self.session.headers.update(self.headers)
+
+	def close(self):
+		self.session.close()
+
+	def execute(self, query, variables):
+		"""
+		Sends a GraphQL query to the Speckle server and returns the response.
+
+		Args:
+			query (str): The GraphQL query.
+			variables (dict, optional): The variables for the GraphQL query. Defaults to None.
 
+		Returns:
+			dict: The response data if the request is successful, None otherwise.
+		"""
+		payload = {"query": query, "variables": variables}
+
+		with PROFILER.call('SpeckleGQL.execute'):
+			response = self.session.post(self.url, json=payload, timeout=self.timeout)
+		return response.json() if response.status_code == 200 else None
+
+	def execute_batch(self, operations, name='Batch'):
+		"""
+		Sends many aliased sub-queries within a single request.
+
+		Returns:
+			dict: The response data by aliases if the request is successful, None otherwise.
+		"""
+		query, variables = self.compose(name, operations)
 		response = self.execute(query, variables)
-		result = response['data']['project']['object']['data']
-		return result
\ No newline at end of file
+		return response['data'] if response else None
+
+	def get_level_data(self, projectId, objectId, idx):
+		"""
+		Hope this is temporary solution and we'll be able to fetch levels from info section.
+		"""
+		return self.get_levels_data(projectId, objectId, [idx])[idx]
+
+	def get_levels_data(self, projectId, objectId, indices):
+		"""
+		Fetches levels of the given story indices within a single request.
+		"""
+		indices = list(indices)
+		response = self.execute_batch(self.levels_operations(projectId, objectId, indices), 'Object')
+		return self.parse_levels(response, indices)
+
+	def get_total_count(self, projectId, objectId, speckle_type):
+		return self.get_total_counts(projectId, objectId, [speckle_type])[speckle_type]
+
+	def get_total_counts(self, projectId, objectId, speckle_types):
+		"""
+		Counts children of the given speckle types within a single request, None counts all of them.
+		"""
+		speckle_types = list(dict.fromkeys(speckle_types))
+		response = self.execute_batch(self.total_counts_operations(projectId, objectId, speckle_types), 'Object')
+		return self.parse_total_counts(response, speckle_types)
+
+	def get_object_data(self, projectId, objectId):
+		response = self.execute_batch({'project': self.object_operation(projectId, objectId)}, 'Object')
+		return self.parse_object(response)
+
+class Backoff():
+	"""
+	Retries a call with exponential backoff and full jitter: the n-th retry waits
+	a random time up to min(max_delay, delay * 2^n) seconds.
+	"""
+
+	def __init__(self, retries=10, delay=3, max_delay=60, retryable=None):
+		self.retries = retries
+		self.delay = delay
+		self.max_delay = max_delay
+		self.retryable = retryable or (lambda error: True)
+		self.log = LogWrapper.get_logger('speckle.client.backoff')
+
+	def wait(self, attempt):
+		return random.uniform(0, min(self.max_delay, self.delay * 2 ** attempt))
+
+	def run(self, call, *args):
+		"""
+		Calls call(attempt, *args) until it succeeds, the retries are out or the error is not retryable.
+		"""
+		for attempt in range(self.retries):
+			try:
+				return call(attempt, *args)
+			except Exception as e:
+				if attempt == self.retries - 1 or not self.retryable(e):
+					raise
+				wait = self.wait(attempt)
+				self.log.warning('Attempt $m(%d) failed: %s, retrying in $m(%.1f) sec', attempt + 1, e, wait)
+				time.sleep(wait)
+
+class SpeckleSender():
+	"""
+	Uploads objects to the server, skipping the ones it already has.
+
+	The object tree is serialized once, the server is asked which ids are missing (/api/diff)
+	and only those are uploaded, in gzipped batches (/objects). Each batch is retried on its own,
+	so a failure does not restart the whole upload.
+	"""
+
+	def __init__(self, host, token, batch_size_mb=1, batch_length=20000, threads=4, timeout=(5, 120)):
+		self.host = host.rstrip('/')
+		self.token = token
+		self.max_size = int(batch_size_mb * 1000 * 1000)
+		self.max_length = batch_length
+		self.threads = threads
+		self.timeout = timeout
+		self.log = LogWrapper.get_logger('speckle.client.sender')
+
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=threads)
+		self.session.mount('http://', adapter)
+		self.session.mount('https://', adapter)
+		self.session.headers.update({
+			"Authorization": f"Bearer {self.token}",
+			"Accept-Encoding": "gzip, deflate"
+		})
+
+	def close(self):
+		self.session.close()
+
+	@staticmethod
+	def retryable(error):
+		"""
+		Connection issues, timeouts, throttling and server side errors are worth another attempt.
+		"""
+		if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+			return True
+		if isinstance(error, requests.HTTPError) and error.response is not None:
+			status = error.response.status_code
+			return status in (408, 429) or status >= 500
+		return False
+
+	@staticmethod
+	def serialize(obj):
+		"""
+		Returns the root id and the memory transport with all the detached objects of the tree.
+		"""
+		memory = MemoryTransport()
+		serializer = BaseObjectSerializer(write_transports=[memory])
+		root, _ = serializer.write_json(obj)
+		return root, memory
+
+	def diff(self, projectId, ids, backoff):
+		"""
+		Asks the server which of the given ids it does not have yet.
+		"""
+		def request(attempt, chunk):
+			response = self.session.post(
+				f"{self.host}/api/diff/{projectId}",
+				data={"objects": json.dumps(chunk)},
+				timeout=self.timeout
+			)
+			response.raise_for_status()
+			return response.json()
+
+		missing = []
+		for i in range(0, len(ids), self.max_length):
+			chunk = ids[i:i+self.max_length]
+			known = backoff.run(request, chunk)
+			missing += [id for id in chunk if not known.get(id)]
+		return missing
+
+	def batches(self, transport, ids):
+		batch, size = [], 0
+		for id in ids:
+			data = transport.get_object(id)
+			if batch and (size + len(data) >= self.max_size or len(batch) >= self.max_length):
+				yield batch
+				batch, size = [], 0
+			batch.append(data)
+			size += len(data)
+		if batch:
+			yield batch
+
+	def upload(self, projectId, batch, number, backoff):
+		payload = "[" + ",".join(batch) + "]"
+		compressed = gzip.compress(payload.encode())
+
+		def request(attempt):
+			self.log.info('Uploading batch $m(%d), attempt $m(%d): $m(%d) objects, $m(%d) bytes ($m(%d) gzipped)', number, attempt + 1, len(batch), len(payload), len(compressed))
+			response = self.session.post(
+				f"{self.host}/objects/{projectId}",
+				files={"batch-1": ("batch-1", compressed, "application/gzip")},
+				timeout=self.timeout
+			)
+			response.raise_for_status()
+
+		backoff.run(request)
+		return len(batch), len(compressed)
+
+	def send(self, projectId, obj, retries=10, delay=3, max_delay=60):
+		"""
+		Uploads the missing objects of the given tree and returns its root id.
+		"""
+		root, memory = self.serialize(obj)
+		return self.transfer(projectId, root, memory, retries, delay, max_delay)
+
+	def transfer(self, projectId, root, transport, retries=10, delay=3, max_delay=60):
+		"""
+		Uploads the missing objects of the tree which is already serialized into the given transport.
+		"""
+		backoff = Backoff(retries, delay, max_delay, retryable=self.retryable)
+		ids = [root] + list(json.loads(transport.get_object(root)).get('__closure', {}))
+		missing = self.diff(projectId, ids, backoff)
+		self.log.info('Server is missing $m(%d) of $m(%d) objects', len(missing), len(ids))
+
+		# batches are read lazily, at most two per thread are kept in memory
+		results = []
+		with ThreadPoolExecutor(max_workers=self.threads) as executor:
+			tasks = set()
+			for i, batch in enumerate(self.batches(transport, missing)):
+				if len(tasks) >= self.threads * 2:
+					done, tasks = wait(tasks, return_when=FIRST_COMPLETED)
+					results += [task.result() for task in done]
+				tasks.add(executor.submit(self.upload, projectId, batch, i + 1, backoff))
+			results += [task.result() for task in tasks]
+
+		self.log.info('Uploaded $m(%d) objects, $m(%d) bytes gzipped', sum(r[0] for r in results), sum(r[1] for r in results))
+		return root
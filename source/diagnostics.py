@@ -0,0 +1,76 @@
+import json
+import logging
+
+from collections import OrderedDict
+
+class Diagnostics():
+	"""
+	Collects the translation issues instead of logging each of them.
+
+	Issues are counted by (category, kind), each element once, with a bounded sample of the element
+	ids, and reported once: as a summary table at the end of the translation or as a json report.
+	An element is told apart among the last seen_size ones, the same issue comes up repeatedly
+	while the element is mapped, not later on.
+	"""
+
+	NO_PROPERTIES = 'no properties'
+	NO_PARAMETERS = 'no general parameters'
+	SKIPPED = 'not translated'
+	NO_HOST_DIRECTION = 'no host direction'
+
+	def __init__(self, sample_size=10, seen_size=10000):
+		self.sample_size = sample_size
+		self.seen_size = seen_size
+		self.issues = {}
+		self.seen = OrderedDict()
+
+	def __len__(self):
+		return sum(count for count, _ in self.issues.values())
+
+	def add(self, category, kind, id=None, count=1):
+		if id is not None:
+			if (category, kind, id) in self.seen:
+				return
+			self.seen[(category, kind, id)] = None
+			if len(self.seen) > self.seen_size:
+				self.seen.popitem(last=False)
+		issue = self.issues.setdefault((category, kind), [0, []])
+		issue[0] += count
+		if id is not None and len(issue[1]) < self.sample_size:
+			issue[1].append(id)
+
+	def merge(self, report):
+		"""
+		Adds the issues of the given report, e.g. collected within a worker process.
+		"""
+		for issue in report:
+			self.add(issue['category'], issue['kind'], count=issue['count'])
+			sample = self.issues[(issue['category'], issue['kind'])][1]
+			sample += issue['sample'][:self.sample_size - len(sample)]
+
+	def clear(self):
+		self.issues = {}
+		self.seen = OrderedDict()
+
+	def report(self):
+		"""
+		Issues as a list of dicts, the most frequent first.
+		"""
+		return [
+			{'category': category, 'kind': kind, 'count': count, 'sample': list(sample)}
+			for (category, kind), (count, sample) in sorted(self.issues.items(), key=lambda item: -item[1][0])]
+
+	def summary(self, log):
+		"""
+		Logs all the issues as one table.
+		"""
+		if not self.issues or not log.isEnabledFor(logging.WARNING):
+			return
+		rows = [f"{'category':<24}{'kind':<24}{'count':>8}  sample"]
+		for issue in self.report():
+			rows.append(f"{str(issue['category']):<24}{issue['kind']:<24}{issue['count']:>8}  {', '.join(map(str, issue['sample']))}")
+		log.warning('Translation issues: %d in %d categories\n%s', len(self), len(self.issues), '\n'.join(rows))
+
+	def to_json(self, path):
+		with open(path, 'w', encoding='utf-8') as file:
+			json.dump({'total': len(self), 'issues': self.report()}, file, ensure_ascii=False, indent=1)
@@ -0,0 +1,204 @@
+import json
+import os
+import sqlite3
+
+from contextlib import closing
+
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+from .cache import ObjectCache
+from .logging import LogWrapper
+from .profiling import PROFILER
+
+class LocalWrapper():
+	"""
+	Reads and writes commits locally instead of the server, e.g. to translate frozen commits
+	at full local speed, to profile or to load test the mapping.
+
+	Commits are addressed as scheme:location#id:
+
+		json:commit.json		{"id": root id, "objects": {id: object}} file
+		sqlite:objects.db#id	ObjectCache database (e.g. the one filled by SpeckleWrapper.download)
+					or specklepy SQLiteTransport one, scope.db, told apart by the schema
+		memory:name#id		MemoryTransport kept by the wrapper until read back (or discarded),
+					memory: alone discards the output
+
+	The scheme is taken from the extension if omitted (.json, .db, .sqlite), the id defaults to
+	the one written last (json, memory). retrieve and publish follow SpeckleWrapper.
+	The databases are closed once read or written, except the ones download and sink return,
+	which are to be closed by the caller (see close).
+	"""
+
+	schemes = ('json', 'sqlite', 'memory')
+
+	def __init__(self):
+		self.log = LogWrapper.get_logger('local')
+		# memory transports by name, with the id of the last commit written into each
+		self.memory = {}
+
+	def parse(self, uri):
+		"""
+		Splits the address into (scheme, location, id).
+		"""
+		scheme, _, rest = uri.partition(':')
+		if scheme not in self.schemes:
+			extension = os.path.splitext(uri.partition('#')[0])[1].lower()
+			scheme = {'.json': 'json', '.db': 'sqlite', '.sqlite': 'sqlite'}.get(extension)
+			if scheme is None:
+				raise ValueError(f'Unknown commit location: {uri}, expected json:, sqlite: or memory:')
+			rest = uri
+		location, _, id = rest.partition('#')
+		return scheme, location, id or None
+
+	def open(self, uri):
+		"""
+		Transport of the given commit to read from and the id of its commit object.
+		"""
+		scheme, location, id = self.parse(uri)
+		if scheme == 'json':
+			with open(location, encoding='utf-8') as file:
+				data = json.load(file)
+			transport = MemoryTransport()
+			transport.objects = {key: json.dumps(obj) for key, obj in data['objects'].items()}
+			id = id or data['id']
+		elif scheme == 'sqlite':
+			if not os.path.exists(location):
+				raise FileNotFoundError(location)
+			transport = self.database(location)
+		else:
+			# read once, not to be kept by a long-running process
+			transport, last = self.memory.pop(location, (None, None))
+			if transport is None:
+				raise KeyError(f'No memory transport: {location}')
+			id = id or last
+		if not id or transport.get_object(id) is None:
+			self.close(transport)
+			if not id:
+				raise ValueError(f'No commit object id: {uri}, expected {scheme}:{location}#id')
+			raise KeyError(f'No commit object {id} in {uri}')
+		return transport, id
+
+	def sink(self, uri):
+		"""
+		Transport to write the given commit into, see publish.
+		"""
+		scheme, location, _ = self.parse(uri)
+		if scheme == 'sqlite':
+			return self.database(location)
+		if scheme == 'memory' and location:
+			return self.memory.get(location, (MemoryTransport(location), None))[0]
+		return MemoryTransport()
+
+	@staticmethod
+	def database(location):
+		"""
+		Transport of the sqlite database: SQLiteTransport for the objects(hash, content) table
+		specklepy writes, ObjectCache for its own or a new database.
+		"""
+		columns = []
+		if os.path.exists(location):
+			with closing(sqlite3.connect(location)) as connection:
+				columns = [row[1] for row in connection.execute('PRAGMA table_info(objects)')]
+		if 'hash' not in columns:
+			return ObjectCache(location, max_size_mb=1e6)
+		# the transport takes the directory and the scope, the file name is always scope.db
+		base_path, name = os.path.split(os.path.abspath(location))
+		scope, extension = os.path.splitext(name)
+		if extension != '.db':
+			raise ValueError(f'Not a SQLiteTransport database name: {location}, expected scope.db')
+		return SQLiteTransport(base_path=base_path, scope=scope)
+
+	@staticmethod
+	def path(transport):
+		"""
+		Path of the database the transport writes into, None for the other transports.
+		"""
+		if isinstance(transport, ObjectCache):
+			return os.path.abspath(transport.path)
+		if isinstance(transport, SQLiteTransport):
+			return os.path.abspath(transport._root_path)
+		return None
+
+	def discard(self, uri):
+		"""
+		Drops the memory transport of the given address, if any, e.g. once the job written into it is done.
+		"""
+		scheme, location, _ = self.parse(uri)
+		if scheme == 'memory':
+			self.memory.pop(location, None)
+
+	@staticmethod
+	def close(transport):
+		"""
+		Closes the database connection of the transport, the memory ones are left as they are.
+		"""
+		if isinstance(transport, (ObjectCache, SQLiteTransport)):
+			transport.close()
+
+	@staticmethod
+	def closure(id, transport):
+		"""
+		(id, json) of the object and all of its children.
+		"""
+		data = transport.get_object(id)
+		yield id, data
+		for child in json.loads(data).get('__closure', {}):
+			yield child, transport.get_object(child)
+
+	def retrieve(self, uri):
+		self.log.info('Reading commit object: $y("%s")', uri)
+		with PROFILER.stage('receive') as stage:
+			transport, id = self.open(uri)
+			try:
+				# what operations.receive does for the objects found locally, without the api imports
+				result = BaseObjectSerializer(read_transport=transport).read_json(transport.get_object(id))
+			finally:
+				self.close(transport)
+			stage['elements'] = result.totalChildrenCount or 0
+		return result
+
+	def download(self, uri):
+		"""
+		Opens the given commit without deserializing it, e.g. for TranslationStream.
+		Returns the transport of the commit and the id of the commit object.
+		"""
+		self.log.info('Opening commit object: $y("%s")', uri)
+		with PROFILER.stage('receive'):
+			return self.open(uri)
+
+	def publish(self, obj, uri, transport=None):
+		"""
+		Writes the given object, or the id of the object tree already serialized into the transport.
+		Returns the id of the commit object.
+		"""
+		# the databases opened here, the given transport is closed by the caller
+		opened = []
+		with PROFILER.stage('publish'):
+			try:
+				if transport is None:
+					transport = self.sink(uri)
+					opened.append(transport)
+					obj, _ = BaseObjectSerializer(write_transports=[transport]).write_json(obj)
+
+				scheme, location, _ = self.parse(uri)
+				if scheme == 'json':
+					with open(location, 'w', encoding='utf-8') as file:
+						json.dump({'id': obj, 'objects': {id: json.loads(data) for id, data in self.closure(obj, transport)}}, file)
+				elif scheme == 'sqlite':
+					# written straight into the database (see sink) or copied there
+					if self.path(transport) != os.path.abspath(location):
+						database = self.database(location)
+						opened.append(database)
+						for id, data in self.closure(obj, transport):
+							database.save_object(id, data)
+						transport = database
+					transport.end_write()
+				elif location:
+					self.memory[location] = (transport, obj)
+			finally:
+				for database in opened:
+					self.close(database)
+		self.log.info('Written commit object: $m(%s) to $y("%s")', obj, uri)
+		return obj
@@ -1,10 +1,39 @@
+import atexit
 import colorama
+import json
 import logging
+import os
+import queue
 import re
+import time
 
 class LogWrapper():
+    """
+    Sets up the console logging once per process, on the first get_logger call.
+
+    Messages may be marked up with $m(...), $y(...), etc. and take %-style arguments, which are
+    only merged when the record is emitted: log.info('Mapped $m(%d) elements', count).
+    """
 
     _configured = False
+    _listener = None
+
+    json_output = False
+    queued = False
+    level = logging.INFO
+
+    @classmethod
+    def configure(cls, json_output=None, queued=None, level=None):
+        """
+        Output options, to be set before the first logger is taken: json lines instead of the
+        colored text and a queue to move the console output to a thread of its own.
+        """
+        if json_output is not None:
+            cls.json_output = json_output
+        if queued is not None:
+            cls.queued = queued
+        if level is not None:
+            cls.level = level
 
     @classmethod
     def get_logger(cls, name):
@@ -15,18 +44,61 @@ class LogWrapper():
 
     @classmethod
     def _setup(cls):
-        colorama.init(autoreset=True)
-        formatter = cls.LogFormatter('%(asctime)s.%(msecs)s %(levelname)s %(name)s: %(message)s', datefmt='%H:%M:%S')
         handler = logging.StreamHandler()
-        handler.setFormatter(formatter)
+        if cls.json_output:
+            handler.setFormatter(cls.JsonFormatter())
+        else:
+            colorize = handler.stream.isatty()
+            if colorize:
+                colorama.init(autoreset=True)
+            handler.setFormatter(cls.LogFormatter(datefmt='%H:%M:%S', colorize=colorize))
+
+        handlers = [handler]
+        if cls.queued:
+            # imported here, it pulls in socket, pickle etc. which most of the runs do not need
+            from logging.handlers import QueueHandler, QueueListener
+            # records are only merged with their arguments on the calling thread, formatted and
+            # written by the listener thread
+            records = queue.SimpleQueue()
+            cls._listener = QueueListener(records, handler, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls._listener.stop)
+            # a forked worker process does not have the listener thread, it writes on its own
+            # (no fork on windows, the spawned workers set up the logging anew)
+            if hasattr(os, 'register_at_fork'):
+                os.register_at_fork(after_in_child=cls._unqueue)
+            handlers = [QueueHandler(records)]
+            handlers[0].setFormatter(logging.Formatter('%(message)s'))
 
         logging.basicConfig(
-            level=logging.INFO,
-            handlers = [handler]
+            level=cls.level,
+            handlers = handlers
         )
 
         log = logging.getLogger('log')
-        log.info(f'Logging service started')
+        log.info('Logging service started')
+
+    @classmethod
+    def _unqueue(cls):
+        if cls._listener is None:
+            return
+        from logging.handlers import QueueHandler
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, QueueHandler):
+                root.removeHandler(handler)
+        for handler in cls._listener.handlers:
+            root.addHandler(handler)
+        cls._listener = None
+
+    markup = re.compile(r'\$([a-z])\((.*?)\)')
+
+    @classmethod
+    def strip(cls, message):
+        """
+        The message without the color markup.
+        """
+        return cls.markup.sub(r'\2', message) if '$' in message else message
 
     class LogFormatter(logging.Formatter):
         colors = {
@@ -39,6 +111,8 @@ class LogWrapper():
             'x': colorama.Fore.RESET,
         }
 
+        reset = colorama.Fore.RESET + colorama.Style.RESET_ALL
+
         levels = {
             'DEBUG': colors['g'],
             'INFO': colors['c'],
@@ -48,20 +122,58 @@ class LogWrapper():
             'CRITICAL': colors['r']
         }
 
+        def __init__(self, datefmt='%H:%M:%S', colorize=True):
+            super().__init__(datefmt=datefmt)
+            self.colorize = colorize
+            # the prefixes and the timestamp of the last second are built once, not per record
+            if colorize:
+                self.prefixes = {level: f'{color}[{level}]{self.reset}' for level, color in self.levels.items()}
+            else:
+                self.prefixes = {level: f'[{level}]' for level in self.levels}
+            self.stamp = (None, None)
+
+        def colorizer(self, match):
+            color = self.colors.get(match.group(1))
+            return f'{color}{match.group(2)}{self.reset}' if color else match.group(2)
+
+        def format(self, record):
+            # the record is left as it is, other handlers get it unchanged
+            message = record.getMessage()
+            if '$' in message:
+                message = LogWrapper.markup.sub(self.colorizer, message) if self.colorize else LogWrapper.strip(message)
+
+            # (second, text) swapped at once, the handlers of several threads may share the formatter
+            second, timestamp = self.stamp
+            if second != int(record.created):
+                second = int(record.created)
+                timestamp = time.strftime(self.datefmt, self.converter(record.created))
+                self.stamp = (second, timestamp)
+
+            level = self.prefixes.get(record.levelname)
+            if level is None:
+                level = f'[{record.levelname}]'
+            result = f'{timestamp}.{int(record.msecs):03d} {level} {record.name}: {message}'
+
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            if record.exc_text:
+                result += '\n' + record.exc_text
+            if record.stack_info:
+                result += '\n' + self.formatStack(record.stack_info)
+            return result
+
+    class JsonFormatter(logging.Formatter):
+        """
+        One json object per record, with the plain message, e.g. for log collectors.
+        """
+
         def format(self, record):
-            reset = colorama.Fore.RESET + colorama.Style.RESET_ALL
-            record.levelname = self.levels.get(record.levelname, "") + '[' + record.levelname +']' + reset
-            record.msecs = str(int(record.msecs)).zfill(3)
-
-            def colorizer(match):
-                if match.group(1)[1] in self.colors:
-                    color = self.colors[match.group(1)[1]]
-                    return f'{color}{match.group(2)}{reset}'
-                return match.group(2)
-
-            pattern = r'(\$[a-z])\((.*?)\)'
-            result = re.sub(pattern, colorizer, record.msg)
-            record.msg = result
-
-            message = super().format(record)
-            return f'{message}'
\ No newline at end of file
+            entry = {
+                'time': record.created,
+                'level': record.levelname,
+                'logger': record.name,
+                'message': LogWrapper.strip(record.getMessage()),
+            }
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False)
@@ -0,0 +1,226 @@
+import cProfile
+import json
+import sys
+import threading
+import time
+import tracemalloc
+
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+try:
+	import resource
+except ImportError:
+	# not available on windows, the peak RSS is not reported there
+	resource = None
+
+class Profiler():
+	"""
+	Instrumentation of the translation stages (connect, receive, map_<category>, boundaries,
+	publish...): wall time, elements, allocations (tracemalloc) and peak RSS, summed up by stage,
+	and the latency of single calls, e.g. the GraphQL queries.
+
+	Does nothing until started, a stage then costs a single check:
+
+		with PROFILER.stage('receive') as stage:
+			...
+			stage['elements'] = count
+	"""
+
+	def __init__(self):
+		self.enabled = False
+		self.stages = {}
+		self.calls = {}
+		self.active = []
+		self.lock = threading.Lock()
+
+	def start(self, memory=False):
+		"""
+		Starts recording, with the allocations if memory is set: tracemalloc slows the run down
+		several times, so the times are not to be compared with the ones recorded without it.
+		"""
+		self.enabled = True
+		if memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+
+	def stop(self):
+		self.enabled = False
+		if tracemalloc.is_tracing():
+			tracemalloc.stop()
+
+	def clear(self):
+		self.stages = {}
+		self.calls = {}
+
+	@staticmethod
+	def get_rss():
+		"""
+		Peak RSS of the process so far, MB.
+		"""
+		if resource is None:
+			return None
+		rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		# bytes on macos, kilobytes elsewhere
+		return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+
+	def sync(self):
+		# the tracemalloc peak is process-wide, it goes to all the active stages before each reset
+		current, peak = tracemalloc.get_traced_memory()
+		for frame in self.active:
+			frame['peak'] = max(frame['peak'], peak)
+		tracemalloc.reset_peak()
+		return current
+
+	def stage(self, name, elements=0):
+		"""
+		Context of the stage, yields a dict to set the number of 'elements' in, if not known upfront.
+		"""
+		if not self.enabled:
+			return nullcontext({})
+		return self.measure(name, elements)
+
+	@contextmanager
+	def measure(self, name, elements):
+		tracing = tracemalloc.is_tracing()
+		frame = {'elements': elements, 'peak': 0}
+		frame['memory'] = self.sync() if tracing else 0
+		self.active.append(frame)
+		ts = time.perf_counter()
+		try:
+			yield frame
+		finally:
+			seconds = time.perf_counter() - ts
+			current = self.sync() if tracing else 0
+			self.active.remove(frame)
+			self.add(name, seconds, frame['elements'])
+			if tracing:
+				with self.lock:
+					stage = self.stages[name]
+					stage['allocated'] = (stage['allocated'] or 0) + current - frame['memory']
+					stage['peak'] = max(stage['peak'] or 0, frame['peak'] - frame['memory'])
+
+	def add(self, name, seconds, elements=0):
+		"""
+		Adds a stage measured elsewhere, e.g. within a worker process.
+		"""
+		if not self.enabled:
+			return
+		with self.lock:
+			stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'elements': 0, 'allocated': None, 'peak': None, 'rss': None})
+			stage['calls'] += 1
+			stage['seconds'] += seconds
+			stage['elements'] += elements
+			stage['rss'] = self.get_rss()
+
+	@contextmanager
+	def call(self, name):
+		"""
+		Records the latency of a single call.
+		"""
+		ts = time.perf_counter()
+		try:
+			yield
+		finally:
+			if self.enabled:
+				latency = time.perf_counter() - ts
+				with self.lock:
+					self.calls.setdefault(name, []).append(latency)
+
+	def report(self):
+		calls = {}
+		for name, latencies in self.calls.items():
+			latencies = sorted(latencies)
+			calls[name] = {
+				'calls': len(latencies),
+				'seconds': sum(latencies),
+				'p50': latencies[len(latencies) // 2],
+				'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+				'max': latencies[-1],
+			}
+		return {'stages': {name: dict(stage) for name, stage in self.stages.items()}, 'calls': calls}
+
+	def summary(self, log):
+		"""
+		Logs the stages and the calls as one table. Nested stages (e.g. boundaries within map_zone)
+		are included in the time of the outer one.
+		"""
+		report = self.report()
+		if not report['stages'] and not report['calls']:
+			return
+
+		def number(value, scale=1, format='.1f'):
+			return '-' if value is None else f'{value / scale:{format}}'
+
+		rows = [f"{'stage':<24}{'calls':>8}{'elements':>10}{'time, s':>10}{'allocated, MB':>15}{'peak, MB':>10}{'RSS, MB':>10}"]
+		for name, stage in report['stages'].items():
+			rows.append(f"{name:<24}{stage['calls']:>8}{stage['elements']:>10}{stage['seconds']:>10.3f}{number(stage['allocated'], 1e6):>15}{number(stage['peak'], 1e6):>10}{number(stage['rss'], format='.0f'):>10}")
+		if report['calls']:
+			rows.append(f"{'call':<24}{'calls':>8}{'p50, ms':>10}{'p95, ms':>10}{'max, ms':>15}{'total, s':>10}")
+			for name, call in report['calls'].items():
+				rows.append(f"{name:<24}{call['calls']:>8}{call['p50'] * 1e3:>10.1f}{call['p95'] * 1e3:>10.1f}{call['max'] * 1e3:>15.1f}{call['seconds']:>10.3f}")
+		log.info('Profile of the stages:\n%s', '\n'.join(rows))
+
+	def to_json(self, path):
+		with open(path, 'w', encoding='utf-8') as file:
+			json.dump(self.report(), file, indent=1)
+
+class StackSampler():
+	"""
+	Samples the stack of the given thread (the current one by default) at the interval, counted
+	in the collapsed format of flamegraph.pl, speedscope etc.: "outer;inner;innermost count".
+	"""
+
+	def __init__(self, interval=0.005, thread=None):
+		self.interval = interval
+		self.ident = (thread or threading.current_thread()).ident
+		self.stacks = Counter()
+		self.done = threading.Event()
+		self.thread = threading.Thread(target=self.run, name='StackSampler', daemon=True)
+
+	def start(self):
+		self.thread.start()
+
+	def stop(self):
+		self.done.set()
+		self.thread.join()
+
+	def run(self):
+		while not self.done.wait(self.interval):
+			frame = sys._current_frames().get(self.ident)
+			stack = []
+			while frame is not None:
+				code = frame.f_code
+				stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+				frame = frame.f_back
+			if stack:
+				self.stacks[';'.join(reversed(stack))] += 1
+
+	def write(self, path):
+		with open(path, 'w', encoding='utf-8') as file:
+			for stack, count in self.stacks.most_common():
+				file.write(f'{stack} {count}\n')
+
+@contextmanager
+def profile(path):
+	"""
+	Profiles the block into the given file: collapsed stacks if it ends with .collapsed or .folded,
+	cProfile stats (see pstats) otherwise.
+	"""
+	if path.endswith(('.collapsed', '.folded')):
+		profiler = StackSampler()
+		profiler.start()
+		try:
+			yield
+		finally:
+			profiler.stop()
+			profiler.write(path)
+	else:
+		profiler = cProfile.Profile()
+		profiler.enable()
+		try:
+			yield
+		finally:
+			profiler.disable()
+			profiler.dump_stats(path)
+
+PROFILER = Profiler()
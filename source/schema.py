@@ -0,0 +1,144 @@
+import hashlib
+import json
+import pathlib
+import threading
+
+from collections.abc import Mapping
+from importlib import resources
+from types import MappingProxyType
+
+from .logging import LogWrapper
+
+def freeze(value):
+	"""
+	Immutable copy of the parsed json: dicts become read-only mappings, lists become tuples.
+	"""
+	if isinstance(value, Mapping):
+		return MappingProxyType({key: freeze(item) for key, item in value.items()})
+	if isinstance(value, (list, tuple)):
+		return tuple(freeze(item) for item in value)
+	return value
+
+def thaw(value):
+	"""
+	Plain (mutable) copy of the frozen value, e.g. to be deserialized or modified.
+	"""
+	if isinstance(value, Mapping):
+		return {key: thaw(item) for key, item in value.items()}
+	if isinstance(value, tuple):
+		return [thaw(item) for item in value]
+	return value
+
+class Schema(Mapping):
+	"""
+	Validated, immutable translation schema, read like the json it is loaded from.
+
+	Besides the data, it keeps the speckle_type > categories tables of the source and target
+	applications and the artifacts compiled from it (see compiled), so they are built once per
+	process, not per translator.
+	"""
+
+	def __init__(self, name, data, stamp=None):
+		self.name = name
+		self.stamp = stamp
+		self.validate(name, data)
+		# content hash, tells apart the translations made with another version of the schema
+		self.digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+		self.data = freeze(data)
+		self.types = {
+			application: self.get_types(categories)
+			for application, categories in self.data.items() if application != 'parameters'}
+		self.artifacts = {}
+		self.lock = threading.Lock()
+
+	def __getitem__(self, key):
+		return self.data[key]
+
+	def __iter__(self):
+		return iter(self.data)
+
+	def __len__(self):
+		return len(self.data)
+
+	@staticmethod
+	def get_types(categories):
+		types = {}
+		for category, schema in categories.items():
+			if schema.get('speckle_type'):
+				types.setdefault(schema['speckle_type'], ())
+				types[schema['speckle_type']] += (category,)
+		return MappingProxyType(types)
+
+	@staticmethod
+	def validate(name, data):
+		"""
+		Checks the structure the translators rely on, raises ValueError otherwise.
+		"""
+		def check(condition, message):
+			if not condition:
+				raise ValueError(f'Invalid schema {name}: {message}')
+
+		check(isinstance(data, dict), 'not a json object')
+		for application in ('archicad', 'revit'):
+			check(isinstance(data.get(application), dict), f'no "{application}" categories')
+			for category, schema in data[application].items():
+				check(isinstance(schema, dict), f'{application}.{category} is not an object')
+		for category, schema in data['archicad'].items():
+			check(isinstance(schema.get('speckle_type'), str), f'archicad.{category} has no speckle_type')
+
+		parameters = data.get('parameters', {'templates': {}, 'categories': {}})
+		templates = parameters.get('templates', {})
+		check('parameter' in data['revit'] or not templates, 'parameter templates without the revit parameter schema')
+		for parameter, template in templates.items():
+			source = template.get('source')
+			check(isinstance(source, list) and len(source) == 2, f'parameter {parameter} has no [group, property] source')
+		for category, names in parameters.get('categories', {}).items():
+			for parameter in names:
+				check(parameter in templates, f'undefined parameter {parameter} of {category}')
+
+	def compiled(self, key, build):
+		"""
+		Returns the artifact built from the schema by build(), building it on the first call.
+		"""
+		with self.lock:
+			if key not in self.artifacts:
+				self.artifacts[key] = build()
+			return self.artifacts[key]
+
+class SchemaRegistry():
+	"""
+	Process-wide cache of the translation schemas.
+
+	Schemas are package resources, so they load from a zip or wheel as well. Each one is parsed
+	and validated once, then reloaded only if its file has changed since.
+	"""
+
+	def __init__(self, package=__package__, directory='schemas'):
+		self.package = package
+		self.directory = directory
+		self.schemas = {}
+		self.lock = threading.Lock()
+
+	@staticmethod
+	def get_stamp(resource):
+		# modification time for the files on disk, the ones in archives could not change
+		if isinstance(resource, pathlib.Path):
+			return resource.stat().st_mtime_ns
+		return None
+
+	def get(self, name):
+		resource = resources.files(self.package).joinpath(self.directory, name + '.json')
+		stamp = self.get_stamp(resource)
+		with self.lock:
+			schema = self.schemas.get(name)
+			if schema is None or schema.stamp != stamp:
+				schema = Schema(name, json.loads(resource.read_text(encoding='utf-8')), stamp)
+				self.schemas[name] = schema
+				LogWrapper.get_logger('app.translator.schema').debug('Schema loaded: $y("%s")', name)
+			return schema
+
+	def clear(self):
+		with self.lock:
+			self.schemas = {}
+
+SCHEMAS = SchemaRegistry()
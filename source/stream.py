@@ -0,0 +1,176 @@
+import json
+
+from specklepy.objects.base import Base
+from specklepy.objects.other import Collection
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer, hash_obj
+from specklepy.transports.memory import MemoryTransport
+
+from .logging import LogWrapper
+from .profiling import PROFILER
+from .translator import TranslatorFactory
+
+class TranslationStream():
+	"""
+	Translates the commit object collection by collection, without materializing it in memory.
+
+	Elements are read from the source transport (e.g. ObjectCache after a download) a window at
+	a time, mapped and written to the output transport straight away, so the peak memory depends
+	on the window size rather than on the model size. Collections and the root are written last,
+	composed from the ids and closures of their already written children.
+	"""
+
+	def __init__(self, source, output, window=100):
+		self.log = LogWrapper.get_logger('app.translator.stream')
+		self.source = source
+		self.output = output
+		self.window = window
+		self.reader = BaseObjectSerializer(read_transport=source)
+
+	def read(self, id):
+		return json.loads(self.source.get_object(id))
+
+	def recompose(self, obj, *detached):
+		"""
+		Deserializes the given object json, except its detached properties.
+		"""
+		obj = {key: value for key, value in obj.items() if key not in detached and key != '__closure'}
+		return self.reader.recompose_base(obj)
+
+	def get_context(self, root):
+		"""
+		Builds the object the translator works with: levels, collection stubs and slab levels,
+		the same as TranslatorArchicad2Revit.get_context does for the worker processes.
+		"""
+		context = Collection()
+		context.name = root.get('name')
+		context.elements = []
+		if '@levels' in root:
+			context['@levels'] = self.reader.recompose_base(root['@levels'])
+		for ref in root['elements']:
+			collection = self.read(ref['referencedId'])
+			dummy = Collection()
+			dummy.name = collection.get('name')
+			dummy.collectionType = collection.get('collectionType')
+			dummy.elements = []
+			if collection.get('name') == 'Slab':
+				for element in collection['elements']:
+					level = self.read(element['referencedId']).get('level')
+					dummy.elements.append(Base(level=self.reader.recompose_base(level) if isinstance(level, dict) else level))
+			context.elements.append(dummy)
+		return context
+
+	def write(self, elements):
+		"""
+		Serializes the given elements into the output transport, returns their (id, closure).
+		"""
+		buffer = MemoryTransport()
+		serializer = BaseObjectSerializer(write_transports=[buffer])
+		children = []
+		for element in elements:
+			id, obj = serializer.traverse_base(element)
+			children.append((id, obj.get('__closure', {})))
+		self.output.begin_write()
+		for id, data in buffer.objects.items():
+			self.output.save_object(id, data)
+		self.output.end_write()
+		return children
+
+	def copy(self, id):
+		"""
+		Copies the element with its children from the source transport as is.
+		"""
+		data = self.source.get_object(id)
+		closure = json.loads(data).get('__closure', {})
+		self.output.begin_write()
+		self.output.save_object(id, data)
+		for child in closure:
+			self.output.save_object(child, self.source.get_object(child))
+		self.output.end_write()
+		return id, closure
+
+	def compose(self, base, detached):
+		"""
+		Serializes the given object with its detached properties already written,
+		given as prop: (id, closure) or prop: [(id, closure), ...].
+		"""
+		for prop, children in detached.items():
+			base[prop] = [] if isinstance(children, list) else None
+		_, obj = BaseObjectSerializer().traverse_base(base)
+
+		# the same closure table BaseObjectSerializer builds while detaching
+		closure = {}
+		for prop in obj:
+			if prop not in detached:
+				continue
+			children = detached[prop]
+			refs = []
+			for id, child_closure in (children if isinstance(children, list) else [children]):
+				for ref, depth in child_closure.items():
+					if ref not in closure or closure[ref] > depth + 1:
+						closure[ref] = depth + 1
+				if id not in closure or closure[id] > 1:
+					closure[id] = 1
+				refs.append({'referencedId': id, 'speckle_type': 'reference'})
+			obj[prop] = refs if isinstance(children, list) else refs[0]
+
+		obj['id'] = ''
+		obj['totalChildrenCount'] = len(closure)
+		obj.pop('__closure', None)
+		id = hash_obj(obj)
+		obj['id'] = id
+		if closure:
+			obj['__closure'] = closure
+		self.output.begin_write()
+		self.output.save_object(id, json.dumps(obj))
+		self.output.end_write()
+		return id, closure
+
+	def run(self, root_id, translator, client=None, **parameters):
+		"""
+		Translates the commit object of the given id, returns the id of the translated one.
+		"""
+		root = self.read(root_id)
+		context = self.get_context(root)
+		translator = TranslatorFactory.get(translator, client, speckle_object=context, **parameters)
+
+		boundaries = translator.add_collection('Room Separation Lines', 'Revit Category')
+		context['elements'].append(boundaries)
+		translator.collections['boundaries'] = len(context['elements'])-1
+
+		collections = []
+		lines = []
+		for ref in root['elements']:
+			collection = self.read(ref['referencedId'])
+			refs = [element['referencedId'] for element in collection['elements']]
+
+			children = []
+			for i in range(0, len(refs), self.window):
+				data = [self.source.get_object(id) for id in refs[i:i+self.window]]
+				groups = translator.group(collection.get('name'), [json.loads(item) for item in data])
+				window = [None] * len(data)
+				for category, indices in groups.items():
+					elements = [self.reader.read_json(data[j]) for j in indices]
+					with PROFILER.stage('map_' + category, len(indices)):
+						for j, element in zip(indices, elements):
+							window[j] = translator.map_element(category, element)
+				mapped = iter(self.write([element for element in window if element is not None]))
+				# the ones not to be translated are copied as is
+				window = [next(mapped) if element is not None else self.copy(id) for id, element in zip(refs[i:i+self.window], window)]
+				children += window
+				# room boundaries are small, but still written as they come
+				lines += self.write(boundaries['elements'])
+				boundaries['elements'] = []
+			collections.append(self.compose(self.recompose(collection, 'elements'), {'elements': children}))
+			self.log.info('Streamed $m(%d) elements of $y("%s")', len(children), collection.get('name'))
+
+		collections.append(self.compose(boundaries, {'elements': lines}))
+
+		detached = {'elements': collections}
+		if '@levels' in root:
+			detached['@levels'] = self.copy(root['@levels']['referencedId'])
+		translated = self.recompose(root, *detached)
+		translated['translatorFingerprint'] = translator.fingerprint
+		id, closure = self.compose(translated, detached)
+		translator.report()
+		self.log.info('Translated commit object: $m(%s), $m(%d) objects', id, len(closure))
+		return id
@@ -1,15 +1,21 @@
 import json
 import math
-import os
 import re
+import time
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from specklepy.objects.base import Base
 from specklepy.objects.other import Collection
-from specklepy.objects.geometry import *
-from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.objects.geometry import Line, Plane, Point
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer, hash_obj
 
+from .diagnostics import Diagnostics
 from .logging import LogWrapper
+from .profiling import PROFILER
+from .schema import SCHEMAS, thaw
+from .view import View, unwrap
 
 LOC = {
 	'general_parameters': {
@@ -51,9 +57,181 @@ LOC = {
 	'window': {
 		'en': 'window',
 		'ua': 'вікно'
+	},
+	'opening': {
+		'en': 'opening',
+		'ua': 'отвір'
 	}
 }
 
+# translator instance of the current worker process, see TranslatorArchicad2Revit.map_parallel
+_worker = None
+
+def _init_worker(translator, speckle_object, collections, parameters):
+	global _worker
+	_worker = translator(None, speckle_object, **parameters)
+	_worker.collections = collections
+
+def _map_chunk(category, elements):
+	"""
+	Maps a chunk of elements within the worker process.
+	Returns mapped elements, the room boundaries each of them created as a side effect,
+	the issues collected while mapping the chunk and the seconds it took.
+	"""
+	ts = time.perf_counter()
+	boundaries = _worker.object['elements'][_worker.collections['boundaries']]['elements']
+	result, lines = [], []
+	for element in elements:
+		start = len(boundaries)
+		result.append(_worker.map_element(category, element))
+		lines.append(boundaries[start:])
+		del boundaries[start:]
+	issues = _worker.diagnostics.report()
+	_worker.diagnostics.clear()
+	return result, lines, issues, time.perf_counter() - ts
+
+class LevelIndex():
+	"""
+	Levels of the commit object, keyed by story index (levels collection)
+	and by name (levels of the slabs, which are used as links for horizontal openings).
+	Built on the first lookup and rebuilt whenever the levels collection is changed.
+	"""
+
+	def __init__(self, speckle_object):
+		self.object = speckle_object
+		self.built = False
+		self.signature = None
+		self.stories = {}
+		self.names = {}
+
+	def get_signature(self):
+		levels = getattr(self.object, '@levels', None)
+		if levels is None:
+			return None
+		elements = levels['elements']
+		return (id(levels), id(elements), len(elements))
+
+	def build(self):
+		self.stories = {}
+		self.names = {}
+		if hasattr(self.object, '@levels'):
+			for level in self.object['@levels']['elements']:
+				self.stories.setdefault(level.index, level)
+		for collection in self.object['elements']:
+			if collection.name == 'Slab':
+				for s in collection['elements']:
+					self.names.setdefault(s['level']['name'], s['level'])
+
+	def refresh(self):
+		signature = self.get_signature()
+		if not self.built or signature != self.signature:
+			self.build()
+			self.built = True
+			self.signature = signature
+
+	def story(self, index):
+		self.refresh()
+		return self.stories.get(index)
+
+	def name(self, name):
+		self.refresh()
+		return self.names.get(name)
+
+class ElementDelta():
+	"""
+	Matches the elements of the commit object against the previous run of the translator,
+	by applicationId (or id, if there is none). Element ids are content hashes, so the element
+	is unchanged if its id is the same as in the previous source commit. Such elements are
+	reused from the previous translated commit instead of being mapped again, as long as it was
+	translated the same way: with the same schema, localization and categories (fingerprint).
+	"""
+
+	def __init__(self, speckle_object=None, source=None, target=None, fingerprint=None):
+		self.source = {}
+		self.target = {}
+		self.reused = 0
+		self.mapped = 0
+		if speckle_object is None or source is None or target is None:
+			return
+		previous = getattr(target, 'translatorFingerprint', None)
+		if previous != fingerprint:
+			LogWrapper.get_logger('app.translator.delta').info(
+				'Previous translation made differently ($y(%s), now $y(%s)), all elements are mapped again', previous, fingerprint)
+			return
+		# top links are resolved through the levels, so any change there affects all elements
+		levels = [getattr(getattr(o, '@levels', None), 'id', None) for o in (speckle_object, source)]
+		if levels[0] != levels[1]:
+			return
+		self.source = self.index(source)
+		self.target = self.index(target)
+
+	@property
+	def active(self):
+		return bool(self.target)
+
+	@staticmethod
+	def key(element):
+		return getattr(element, 'applicationId', None) or getattr(element, 'id', None)
+
+	def index(self, speckle_object):
+		result = {}
+		for collection in speckle_object['elements']:
+			if collection.name == 'Room Separation Lines':
+				continue
+			for element in collection['elements']:
+				key = self.key(element)
+				if key is not None:
+					# ambiguous keys are always mapped again
+					result[key] = None if key in result else element
+		return result
+
+	def get(self, speckle_object):
+		"""
+		Returns the previous translation of the given element, if it is unchanged since.
+		"""
+		key = self.key(speckle_object)
+		previous = self.source.get(key)
+		translated = self.target.get(key)
+		if previous is not None and translated is not None and previous.id == speckle_object.id:
+			# skip the ones which were not translated at all last time
+			if translated.speckle_type != speckle_object.speckle_type:
+				self.reused += 1
+				return translated
+		self.mapped += 1
+		return None
+
+class ElementProperties():
+	"""
+	Lazy accessor of the element properties (elementProperties), read like a dict of the property
+	groups. Each group is looked up on the first access only and kept while the element is mapped.
+	"""
+
+	def __init__(self, properties):
+		self.properties = properties
+		self.groups = {}
+
+	def __contains__(self, name):
+		return self.get(name) is not None
+
+	def __getitem__(self, name):
+		group = self.get(name)
+		if group is None:
+			raise KeyError(name)
+		return group
+
+	def get(self, name, default=None):
+		if name not in self.groups:
+			self.groups[name] = self.properties.get(name)
+		group = self.groups[name]
+		return default if group is None else group
+
+	def value(self, group, name, default=None):
+		"""
+		Value of the given property, or the default if either the group or the property is missing.
+		"""
+		group = self.get(group)
+		return group.get(name, default) if group is not None else default
+
 class TranslatorFactory:
 
 	@staticmethod
@@ -96,16 +274,32 @@ class Translator(ABC):
 			return BaseObjectSerializer().traverse_base(lineObj)[1]
 		return lineObj
 
+	@staticmethod
+	def add_polyline(coords, units='m'):
+		"""
+		Converts the flat x,y,z coordinate list of the closed polyline into its lines, serialized
+		the same way add_line(..., traverse=True) does, but without the intermediate objects.
+		The last point is redundant, as it repeats the first one.
+		"""
+		points = []
+		for x, y, z in zip(coords[0:-3:3], coords[1:-3:3], coords[2:-3:3]):
+			point = {'id': '', 'speckle_type': 'Objects.Geometry.Point', 'totalChildrenCount': 0, 'applicationId': None, 'units': units, 'x': x, 'y': y, 'z': z}
+			point['id'] = hash_obj(point)
+			points.append(point)
+
+		lines = []
+		for start, end in zip(points, points[1:] + points[:1]):
+			line = {'id': '', 'speckle_type': 'Objects.Geometry.Line', 'totalChildrenCount': 0, 'applicationId': None, 'bbox': None, 'domain': None, 'end': end, 'length': None, 'start': start, 'units': units}
+			line['id'] = hash_obj(line)
+			lines.append(line)
+		return lines
+
 	@staticmethod
 	def get_schema(name):
 		"""
-		Loads translation schema.
+		Loads translation schema, see SchemaRegistry.
 		"""
-		source = os.path.join(os.path.dirname(os.path.abspath(__file__)).replace('source', 'schemas'), name + '.json')
-		with open(source, 'r') as file:
-			schema = json.load(file)
-		if schema:
-			return schema
+		return SCHEMAS.get(name)
 
 	@staticmethod
 	def get_vector_direction(line):
@@ -127,23 +321,62 @@ class Translator(ABC):
 		"""
 		pass
 
+	# override_schema plan operations
+	SET, ENTER, LEAVE = range(3)
+
+	@staticmethod
+	def compile_schema(schema):
+		"""
+		Flattens the schema into a plan of (operation, key, value) steps, so it could be applied
+		to each element without recursion: SET the key to the override or the default value,
+		ENTER the nested structure (created from the typed stub, if missing) and LEAVE it.
+		"""
+		plan = []
+		stack = [iter(schema.items())]
+		while stack:
+			item = next(stack[-1], None)
+			if item is None:
+				stack.pop()
+				if stack:
+					plan.append((Translator.LEAVE, None, None))
+				continue
+			key, value = item
+			if not isinstance(value, Mapping):
+				plan.append((Translator.SET, key, thaw(value)))
+			else:
+				# typed stub, so views could create the corresponding Base object at once
+				stub = {'speckle_type': value['speckle_type']} if 'speckle_type' in value else {}
+				plan.append((Translator.ENTER, key, stub))
+				stack.append(iter(value.items()))
+		return tuple(plan)
+
 	def override_schema(self, entity, schema, parameters):
 		"""
 		Replaces existing object structure my the specified parameters of the given schema.
 		Used to enable mapping options within the Revit environmnet while receving commits.
+		The schema is either a dict or the plan compiled from it by compile_schema.
 		"""
-		for key, value in schema.items():
-			if not isinstance(value, dict):
+		plan = self.compile_schema(schema) if isinstance(schema, Mapping) else schema
+		root = entity
+		stack = []
+		for operation, key, value in plan:
+			if operation == Translator.SET:
 				entity[key] = parameters[key] if parameters and key in parameters else value
+			elif operation == Translator.ENTER:
+				if not key in entity or entity[key] is None:
+					entity[key] = dict(value)
+				stack.append((entity, parameters))
+				entity = entity[key]
+				parameters = parameters[key]
 			else:
-				if not key in entity:
-					dummy = {} if isinstance(value, dict) else None
-					entity[key] = dummy
-				self.override_schema(entity[key], value, parameters[key])
-		return entity
+				entity, parameters = stack.pop()
+		return root
 
 class TranslatorArchicad2Revit(Translator):
 
+	# frames of the element tree walk, see map_element
+	VISIT, ATTACH = range(2)
+
 	def __init__(self, client, speckle_object=None, wrapper=None, **parameters):
 		self.log = LogWrapper.get_logger('app.translator.a2r')
 		self.client = client
@@ -153,10 +386,75 @@ class TranslatorArchicad2Revit(Translator):
 		self.source = 'archicad'
 		self.target = 'revit'
 		self.schema = self.get_schema('remap_archicad2revit')
+		self.plans = self.schema.compiled('plans', self.get_plans)
+		self.injections = self.schema.compiled('injections', self.get_injections)
 		self.categories = self.get_filtered_categories(parameters)
+		self.mappers, self.types, self.element_types = self.get_dispatch()
+		# localized property names, resolved once per run
+		loc = parameters.get('loc') or 'en'
+		if loc not in LOC['general_parameters']:
+			raise ValueError(f"Unknown localization: {loc}, expected one of: {', '.join(LOC['general_parameters'])}")
+		self.keys = {name: names[loc] for name, names in LOC.items()}
+		# stamped on the translated commit object, see ElementDelta
+		self.fingerprint = f"{self.schema.name}:{self.schema.digest} loc:{loc} categories:{','.join(sorted(self.categories))}"
+		self.accessors = {}
+		self.diagnostics = Diagnostics()
 		self.collections = {}
+		self.levels = LevelIndex(self.object)
+		self.delta = ElementDelta(self.object, *parameters.get('previous') or (), fingerprint=self.fingerprint)
 		self.parameters = parameters
 
+	def get_context(self):
+		"""
+		Builds a lightweight copy of the commit object to be shipped to the worker processes.
+		Keeps the collections layout and levels, but not the elements themselves,
+		except the slab levels which are used as links for horizontal openings.
+		"""
+		context = Collection()
+		context.name = getattr(self.object, 'name', None)
+		context.elements = []
+		if hasattr(self.object, '@levels'):
+			context['@levels'] = self.object['@levels']
+		for collection in self.object['elements']:
+			dummy = self.add_collection(collection.name, collection.collectionType)
+			if collection.name == 'Slab':
+				dummy.elements = [Base(level=s['level']) for s in collection['elements']]
+			context.elements.append(dummy)
+		return context
+
+	def get_plans(self):
+		"""
+		Compiles the target schemas, walls get a plan per baseline kind.
+		"""
+		plans = {name: self.compile_schema(schema) for name, schema in self.schema['revit'].items()}
+		plans['wall_straight'] = self.compile_schema(dict(self.schema['revit']['wall'], baseLine=self.schema['revit']['wall_base']))
+		plans['wall_curved'] = self.compile_schema(dict(self.schema['revit']['wall'], baseLine=self.schema['revit']['wall_base_curved']))
+		return plans
+
+	def get_injections(self):
+		"""
+		Builds the revit parameter templates declared in the schema once, listed by category.
+		Each one is (name, property group, property name, template).
+		"""
+		templates = {}
+		for name, declaration in self.schema['parameters']['templates'].items():
+			parameter = dict(self.schema['revit']['parameter'], name=name, applicationInternalName=name)
+			parameter.update({key: value for key, value in declaration.items() if key != 'source'})
+			templates[name] = (name, *declaration['source'], unwrap(parameter))
+		return {category: [templates[name] for name in names] for category, names in self.schema['parameters']['categories'].items()}
+
+	def inject_parameters(self, category, element, properties):
+		"""
+		Adds the parameters declared for the category, filled with the values of the element properties.
+		"""
+		parameters = element['parameters']
+		for name, group, prop, template in self.injections.get(category, ()):
+			# a copy sharing the keys of the template, only the value is per element
+			parameter = object.__new__(type(template))
+			parameter.__dict__.update(template.__dict__)
+			parameter.__dict__['value'] = unwrap(properties.value(group, prop)) if properties else None
+			parameters[name] = parameter
+
 	def get_filtered_categories(self, parameters):
 		"""
 		Retrieves category names that were specified manually. Otherwise, keep the full list.
@@ -164,14 +462,61 @@ class TranslatorArchicad2Revit(Translator):
 		categories = parameters.get('categories', [key for key, value in self.schema['archicad'].items()])
 		return categories
 
+	def get_dispatch(self):
+		"""
+		Builds the routing tables once: mappers of the categories to be translated,
+		speckle_type and (localized) element type to category.
+		"""
+		mappers = {category: getattr(self, 'map_' + category) for category in self.categories if hasattr(self, 'map_' + category)}
+		element_types = {category: category for category in self.schema[self.source]}
+		for category in ('door', 'window', 'opening'):
+			for name in LOC[category].values():
+				element_types[name.lower()] = category
+		return mappers, self.schema.types[self.source], element_types
+
+	def route(self, speckle_object, collection=None):
+		"""
+		Finds the category of the element by its speckle_type. Types shared by several categories
+		(or unknown ones) are resolved by the element type, then by name of the collection.
+		Returns None if the element is not to be translated.
+		"""
+		element = View.of(speckle_object)
+		candidates = self.types.get(element.get('speckle_type'), ())
+		category = candidates[0] if len(candidates) == 1 else None
+		if category is None:
+			for name in (element.get('elementType'), collection):
+				name = self.element_types.get(str(name).lower()) if name else None
+				if name and (not candidates or name in candidates):
+					category = name
+					break
+		return category if category in self.mappers else None
+
+	def group(self, collection, elements):
+		"""
+		Groups the indices of the collection elements by category, in order of their first appearance.
+		Elements which are not to be translated are left as is, see diagnostics.
+		"""
+		groups = {}
+		for i, element in enumerate(elements):
+			groups.setdefault(self.route(element, collection), []).append(i)
+		for i in groups.pop(None, []):
+			self.diagnostics.add(collection, Diagnostics.SKIPPED, View.of(elements[i]).get('id'))
+		return groups
+
 	def get_element_properties(self, speckle_object):
 		"""
-		Retrieves properties data for the given object.
+		Retrieves properties data for the given object, see ElementProperties.
+		The accessor is kept for the element until the next one is mapped (see map_element).
 		"""
 		if 'elementProperties' in speckle_object:
-			return speckle_object['elementProperties']
+			properties = speckle_object['elementProperties']
+			properties = properties.target if isinstance(properties, View) else properties
+			# keyed by the properties themselves, they are shared by the copies of the element
+			if id(properties) not in self.accessors:
+				self.accessors[id(properties)] = (properties, ElementProperties(View.of(properties)))
+			return self.accessors[id(properties)][1]
 		else:
-			self.log.warning(f"No properties found for {speckle_object['elementType']}: $m({speckle_object['id']})")
+			self.diagnostics.add(speckle_object['elementType'], Diagnostics.NO_PROPERTIES, speckle_object['id'])
 		return None
 
 	def get_general_parameters(self, speckle_object):
@@ -180,10 +525,10 @@ class TranslatorArchicad2Revit(Translator):
 		"""
 		properties = self.get_element_properties(speckle_object)
 		if properties:
-			if LOC['general_parameters'][self.parameters['loc']] in properties:
-				return properties[LOC['general_parameters'][self.parameters['loc']]]
+			if self.keys['general_parameters'] in properties:
+				return properties[self.keys['general_parameters']]
 			else:
-				self.log.warning(f"No parameters found for {speckle_object['elementType']}: $m({speckle_object['id']})")
+				self.diagnostics.add(speckle_object['elementType'], Diagnostics.NO_PARAMETERS, speckle_object['id'])
 		return {}
 
 	def get_material_body(self, speckle_object):
@@ -199,41 +544,48 @@ class TranslatorArchicad2Revit(Translator):
 		body = f"{structure[speckle_object['structure']]} ({speckle_object.get('thickness')}{speckle_object.get('units')})"
 		return body if body else None
 
-	def get_top_link(self, speckle_object, traverse=False):
+	def get_top_link(self, speckle_object):
 		"""
 		Retrieves the top link of the given element.
 		"""
 		general = self.get_general_parameters(speckle_object)
 		top_level = None
-		top_link = general.get(LOC['top_link_story'][self.parameters['loc']], '')
+		top_link = general.get(self.keys['top_link_story'], '')
 		top_link_ref = re.search(r'\+ (\d+)', top_link)
 		if top_link_ref and top_link_ref.group(1) and hasattr(self.object, '@levels'):
 			top_link_idx = speckle_object['level']['index'] + int(top_link_ref.group(1))
-			for level in self.object['@levels']['elements']:
-				if top_link_idx == level.index:
-					if traverse:
-						return BaseObjectSerializer().traverse_base(level)[1]
-					return level
+			return self.levels.story(top_link_idx)
 		return None
 
+	def get_boundaries(self, speckle_object):
+		"""
+		Builds the room separation lines along the outline of the given zone.
+		"""
+		zone = View.of(speckle_object)
+		boundaries = []
+		for segment in zone['outline']['segments']:
+			boundary = {}
+			boundary['level'] = zone['level']
+			boundary['units'] = 'm'
+			boundary['baseCurve'] = segment
+			boundary['speckle_type'] = 'Objects.BuiltElements.Revit.Curve.RoomBoundaryLine'
+			boundaries.append(unwrap(boundary))
+		return boundaries
+
 	def get_link(self, name=None):
 		if name:
-			for collection in self.object['elements']:
-				if collection.name == 'Slab':
-					for s in collection['elements']:
-						if s['level']['name'] == name:
-							return BaseObjectSerializer().traverse_base(s['level'])[1]
+			return self.levels.name(name)
 		return None
 
 	def log_stats(self):
 		"""
 		Display some stats info
 		"""
-		total = self.client.query('get_total_count', 'aeb487f0e6', self.object.id, None)
-		self.log.info(f"Commit object entities: $m({total})")
-		for category in self.categories:
-			count = self.client.query('get_total_count', 'aeb487f0e6', self.object.id, self.schema['archicad'][category]['speckle_type'])
-			self.log.info(f'Total {category} objects: $m({count})')
+		types = [self.schema['archicad'][category]['speckle_type'] for category in self.categories]
+		counts = self.client.query('get_total_counts', 'aeb487f0e6', self.object.id, [None] + types)
+		self.log.info('Commit object entities: $m(%d)', counts[None])
+		for category, speckle_type in zip(self.categories, types):
+			self.log.info('Total %s objects: $m(%d)', category, counts[speckle_type])
 
 	def map(self):
 		# self.log_stats()
@@ -241,8 +593,8 @@ class TranslatorArchicad2Revit(Translator):
 		# seems to be more stable to assign objects onto the existing levels
 		# levels = self.add_collection('Levels', 'Levels Type')
 		# self.object['@levels'] = levels
-		# for i in range(-10, 20):
-		# 	story = self.client.query('get_level_data', 'aeb487f0e6', self.object.id, i)
+		# stories = self.client.query('get_levels_data', 'aeb487f0e6', self.object.id, range(-10, 20))
+		# for i, story in stories.items():
 		# 	if story:
 		# 		self.log.info(f"Level found: $y(\"{story['name']}\"), $m({story['elevation']})")
 		# 		level = self.map_story(story)
@@ -252,28 +604,172 @@ class TranslatorArchicad2Revit(Translator):
 		boundaries = self.add_collection('Room Separation Lines', 'Revit Category')
 		self.object['elements'].append(boundaries)
 		self.collections['boundaries'] = len(self.object['elements'])-1
+		self.object['translatorFingerprint'] = self.fingerprint
 
-		# iterate
-		for collection in self.object['elements']:
-			category = collection.name.lower()
-			if collection.name == 'Room Separation Lines': # rewrite & add more
-				pass
-			elif category in self.categories:
-				mapper = getattr(self, 'map_' + category)
-				for i in range(0, len(collection['elements'])):
-					collection['elements'][i] = mapper(
-						speckle_object = collection['elements'][i]
-					)
+		workers = self.parameters.get('workers') or 1
+		if workers > 1:
+			self.map_parallel(workers)
+		else:
+			# iterate
+			for collection in self.object['elements']:
+				if collection.name == 'Room Separation Lines': # rewrite & add more
+					continue
+				elements = collection['elements']
+				for category, indices in self.group(collection.name, elements).items():
+					with PROFILER.stage('map_' + category, len(indices)):
+						for i in indices:
+							previous = self.delta.get(elements[i])
+							if previous is not None:
+								elements[i] = self.reuse(category, elements[i], previous)
+							else:
+								elements[i] = self.map_element(category, elements[i])
+
+		if self.delta.active:
+			self.log.info('Incremental translation: $m(%d) elements mapped, $m(%d) reused', self.delta.mapped, self.delta.reused)
+
+		self.report()
+
+	def report(self):
+		"""
+		Reports the issues collected while mapping: a summary table, and the json report if requested.
+		"""
+		self.diagnostics.summary(self.log)
+		if self.parameters.get('report'):
+			self.diagnostics.to_json(self.parameters['report'])
+
+	def map_element(self, category, speckle_object, **parameters):
+		"""
+		Maps the element together with the elements nested in it, at any depth, without recursion.
+		Each nested element is mapped after its host, with the host context (see get_host),
+		and is put back into the mapped host before the host itself is put into its place.
+		"""
+		self.accessors = {}
+		root = [speckle_object]
+		# (VISIT, container, key, category, context) or (ATTACH, container, key, view)
+		stack = [(self.VISIT, root, 0, category, parameters)]
+		while stack:
+			frame = stack.pop()
+			if frame[0] == self.ATTACH:
+				_, container, key, element = frame
+				# unchanged elements are not written, so their hosts are not copied
+				if unwrap(container[key]) is not element.target:
+					container[key] = element.target
+				continue
+
+			_, container, key, category, context = frame
+			# a view of its own, so the copies on write do not go up the whole tree
+			element = View.of(unwrap(container[key]))
+			nested = element.get('elements')
+			host = self.get_host(category, element) if nested else {}
+			if category:
+				element = View.of(self.mappers[category](speckle_object=element.target, **context))
+				if context.get('host_level') is not None:
+					element['level'] = context['host_level']
+			elif context:
+				self.diagnostics.add(element.get('elementType'), Diagnostics.SKIPPED, element.get('id'))
+			stack.append((self.ATTACH, container, key, element))
+
+			if nested:
+				nested = element['elements']
+				for i in reversed(range(0, len(nested))):
+					stack.append((self.VISIT, nested, i, self.route(nested[i]), host))
+		return root[0]
+
+	def get_host(self, category, speckle_object):
+		"""
+		Context of the host passed to the elements nested in it: host category, level, thickness
+		and the baseline points of walls. The direction of a curved wall is the one of its chord,
+		from the start to the end of the arc, none if the wall has no length. The other hosts have
+		no points, doors and windows nested in them are left as they are (see map_wido).
+		"""
+		element = View.of(speckle_object)
+		if category == 'wall':
+			baseline = element['baseLine']
+			start, end = baseline['start'], baseline['end']
+			if start['x'] != end['x'] or start['y'] != end['y']:
+				direction = self.get_vector_direction(baseline)
 			else:
-				self.log.warning(f"Translation skipped for category: $y(\"{collection.name}\")")
+				direction = {'x': None, 'y': None}
+			return {
+				'host': category,
+				'host_level': element['level'],
+				'host_thickness': element['thickness'],
+				'points': {'sx': baseline['start']['x'], 'sy': baseline['start']['y'], 'sz': baseline['start']['z'], 'dx': direction['x'], 'dy': direction['y']}
+			}
+		if category in ('slab', 'roof'):
+			return {
+				'host': category,
+				'host_level': element['level'],
+				'host_thickness': element['thickness']
+			}
+		return {}
+
+	def reuse(self, category, speckle_object, translated):
+		"""
+		Takes the previous translation of the unchanged element.
+		Side effects of the mapper (room boundaries) are reproduced from the source element.
+		"""
+		if category == 'zone':
+			self.object['elements'][self.collections['boundaries']]['elements'].extend(self.get_boundaries(speckle_object))
+		return translated
+
+	def map_parallel(self, workers):
+		"""
+		Splits each collection into chunks and maps them within the process pool.
+		Results are written back in the original order, so are the room boundaries.
+		"""
+		self.log.info('Mapping within $m(%d) worker processes', workers)
+		chunk_size = self.parameters.get('chunk_size')
+		# previous commits stay here, unchanged elements are not shipped to the workers
+		parameters = {key: value for key, value in self.parameters.items() if key != 'previous'}
+		parameters['workers'] = 1
+		initargs = (type(self), self.get_context(), self.collections, parameters)
+
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+			tasks = []
+			for collection in self.object['elements']:
+				if collection.name == 'Room Separation Lines':
+					continue
+				elements = collection['elements']
+				for category, indices in self.group(collection.name, elements).items():
+					reused = {}
+					pending = []
+					for i in indices:
+						previous = self.delta.get(elements[i])
+						if previous is not None:
+							reused[i] = previous
+						else:
+							pending.append(i)
+					chunks = []
+					size = chunk_size or max(1, math.ceil(len(pending) / (workers * 4)))
+					for i in range(0, len(pending), size):
+						chunk = pending[i:i+size]
+						chunks.append((chunk, executor.submit(_map_chunk, category, [elements[j] for j in chunk])))
+					tasks.append((collection, category, indices, reused, chunks))
+
+			boundaries = self.object['elements'][self.collections['boundaries']]['elements']
+			for collection, category, indices, reused, chunks in tasks:
+				mapped = {}
+				for chunk, task in chunks:
+					result, lines, issues, seconds = task.result()
+					mapped.update(zip(chunk, zip(result, lines)))
+					self.diagnostics.merge(issues)
+					# seconds within the worker, the stage sums them up over the workers
+					PROFILER.add('map_' + category, seconds, len(chunk))
+				elements = collection['elements']
+				for i in indices:
+					if i in reused:
+						elements[i] = self.reuse(category, elements[i], reused[i])
+					else:
+						elements[i], lines = mapped[i]
+						boundaries.extend(lines)
 
 	# TODO !
 	def map_beam(self, speckle_object, **parameters):
 		"""
 		Remap beam schema.
 		"""
-		bos = BaseObjectSerializer()
-		beam = bos.traverse_base(speckle_object)[1]
+		beam = View.of(speckle_object)
 
 		justification = {
 			0: {'jy': 0, 'jz': 0},	# left, top
@@ -297,8 +793,8 @@ class TranslatorArchicad2Revit(Translator):
 			surface = ' ' + str(beam['segments']['Segment #1']['topMaterial'])
 
 		general = self.get_general_parameters(beam)
-		width = general.get(LOC['cross_section_width_bottom_start_cut'][self.parameters['loc']])
-		height = general.get(LOC['cross_section_height_bottom_start_cut'][self.parameters['loc']])
+		width = general.get(self.keys['cross_section_width_bottom_start_cut'])
+		height = general.get(self.keys['cross_section_height_bottom_start_cut'])
 		typo = f'{material} {width}x{height}{surface}'
 
 		overrides = {
@@ -315,41 +811,24 @@ class TranslatorArchicad2Revit(Translator):
 				}
 			}
 		}
-		beam = self.override_schema(beam, self.schema['revit']['beam'], overrides)
-
-		properties = self.get_element_properties(beam)
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-		
-		beam['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		beam = self.override_schema(beam, self.plans['beam'], overrides)
+
+		self.inject_parameters('beam', beam, self.get_element_properties(beam))
 
-		return bos.recompose_base(beam)
+		return beam.target
 
 	# TODO !
 	def map_column(self, speckle_object, **parameters):
 		"""
 		Remap column schema.
 		"""
-		bos = BaseObjectSerializer()
-		column = bos.traverse_base(speckle_object)[1]
+		column = View.of(speckle_object)
 
 		width = round(column['segments']['Segment #1']['assemblySegmentData']['nominalWidth']*1000)/1000
 		height = round(column['segments']['Segment #1']['assemblySegmentData']['nominalHeight']*1000)/1000
 
 		if not column.get('topLevel'):
-			top_level = self.get_top_link(column, traverse=True)
+			top_level = self.get_top_link(column)
 
 		if not top_level:
 			top_level = column['level']
@@ -371,42 +850,11 @@ class TranslatorArchicad2Revit(Translator):
 			'topOffset': top_offset,
 			'parameters': {}
 		}
-		column = self.override_schema(column, self.schema['revit']['column'], overrides)
-
-		properties = self.get_element_properties(column)
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-		role = group_b.get('spk_prop_discipline', None)
-
-		column['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		column = self.override_schema(column, self.plans['column'], overrides)
 
-		column['parameters']['MRT_Discipline'] = {
-			"name": "MRT_Discipline",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Discipline",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": role
-		}
+		self.inject_parameters('column', column, self.get_element_properties(column))
 
-		return bos.recompose_base(column)
+		return column.target
 
 	# TODO !
 	def map_curtainwall(self, speckle_object, **parameters):
@@ -449,21 +897,18 @@ class TranslatorArchicad2Revit(Translator):
 		"""
 		def map_opening_horizontal(speckle_object, **parameters):
 			""" shaft openings in slabs, roofs, meshes? """
-			# opening = speckle_object
-
-			bos = BaseObjectSerializer()
-			opening = bos.traverse_base(speckle_object)[1]
+			opening = View.of(speckle_object)
 
 			properties = self.get_element_properties(opening)
 
 			group = properties.get('ОТВОРИ', {})
 			btm_level_name = group.get('spk_opening_level', None)
-			btm_level = self.get_link(name=btm_level_name)
+			btm_level = self.get_link(name=btm_level_name) or parameters.get('host_level')
 
-			general = properties.get(LOC['general_parameters'][self.parameters['loc']], {})
-			btm_offset = general.get(LOC['bottom_elevation_home_story'][self.parameters['loc']], 0) if general else 0
-			top_offset = general.get(LOC['top_elevation_home_story'][self.parameters['loc']], 0) if general else 0
-			btm_elevation = general.get(LOC['bottom_elevation_project_zero'][self.parameters['loc']], 0) if general else 0
+			general = properties.get(self.keys['general_parameters'], {})
+			btm_offset = general.get(self.keys['bottom_elevation_home_story'], 0) if general else 0
+			top_offset = general.get(self.keys['top_elevation_home_story'], 0) if general else 0
+			btm_elevation = general.get(self.keys['bottom_elevation_project_zero'], 0) if general else 0
 			if not top_offset: top_offset = 0
 			altitude = top_offset - btm_offset
 
@@ -484,30 +929,15 @@ class TranslatorArchicad2Revit(Translator):
 					'segments': []
 				}
 			}
-			shaft = self.override_schema(opening, self.schema['revit']['shaft_horizontal'], overrides)
+			shaft = self.override_schema(opening, self.plans['shaft_horizontal'], overrides)
 
 			# flat list with x,y,z coordinates of each point
 			# the last pair is redundant, as points to the first coordinates
 			if 'value' in shaft['outline']:
-				coords = shaft['outline']['value']
-				for i in range(0, len(coords) // 3 - 2):
-					sidx = i * 3
-					eidx = (i + 1) * 3
-					shaft['outline']['segments'].append(
-						self.add_line(
-							coords[sidx], coords[sidx+1], coords[sidx+2],
-							coords[eidx], coords[eidx+1], coords[eidx+2],
-							traverse=True))
-
-				shaft['outline']['segments'].append(
-					self.add_line(
-						coords[-6], coords[-5],coords[-4],
-						coords[0], coords[1], coords[2],
-						traverse=True))
+				# appended to the list as is, the views would turn them back into objects
+				shaft['outline']['segments'].own().extend(self.add_polyline(shaft['outline']['value'].target))
 
-			# return shaft
-
-			return bos.recompose_base(shaft)
+			return shaft.target
 
 
 		def map_opening_vertical(speckle_object, **parameters):
@@ -532,12 +962,39 @@ class TranslatorArchicad2Revit(Translator):
 		"""
 		return speckle_object
 
+	# canonical plane of the rebuilt arcs, shared by all of them as it is never modified
+	PLANE_XY = Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3])
+
+	def get_segment_overrides(self, segment):
+		"""
+		Redefines the plane & coordinates of the curved segment, converted to millimeters.
+		"""
+		start, mid, end = segment['startPoint'], segment['midPoint'], segment['endPoint']
+		return {
+			'plane': self.PLANE_XY,
+			'startPoint': self.add_point(start['x']*1000, start['y']*1000, start['z']*1000, units='mm'),
+			'midPoint': self.add_point(mid['x']*1000, mid['y']*1000, mid['z']*1000, units='mm'),
+			'endPoint': self.add_point(end['x']*1000, end['y']*1000, end['z']*1000, units='mm'),
+			'angleRadians': segment['angleRadians']
+		}
+
+	def map_outline(self, element):
+		"""
+		Rebuilds the curved segments of the slab/roof outline.
+		"""
+		# note: there is an issue with curved slabs/roofs,
+		# unit convertion doesn't work for some reason, so we have to redefine these segments
+		segments = element['outline']['segments']
+		for i in range(0, len(segments)):
+			if 'plane' in segments[i]:
+				segment = segments[i]
+				segments[i] = self.override_schema(segment, self.plans['floor_segment_curved'], self.get_segment_overrides(segment))
+
 	def map_roof(self, speckle_object, **parameters):
 		"""
 		Remap roof schema
 		"""
-		bos = BaseObjectSerializer()
-		roof = bos.traverse_base(speckle_object)[1]
+		roof = View.of(speckle_object)
 
 		general = self.get_general_parameters(roof)
 		btm_offset = general.get('Bottom Elevation To Home Story', 0)
@@ -561,73 +1018,22 @@ class TranslatorArchicad2Revit(Translator):
 			}
 		}
 
-		# note: there is an issue with curved slabs/roofs,
-		# unit convertion doesn't work for some reason, so we have to redefine this segment
-		for i in range(0, len(roof['outline']['segments'])-1):
-			if 'plane' in roof['outline']['segments'][i]:
-				segment = roof['outline']['segments'][i]
-				# redefine plane & coordinates
-				planeObj = Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3])
-				plane = BaseObjectSerializer().traverse_base(planeObj)[1]
-				start = self.add_point(
-					segment['startPoint']['x']*1000,
-					segment['startPoint']['y']*1000,
-					segment['startPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-				mid = self.add_point(
-					segment['midPoint']['x']*1000,
-					segment['midPoint']['y']*1000,
-					segment['midPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-				end = self.add_point(
-					segment['endPoint']['x']*1000,
-					segment['endPoint']['y']*1000,
-					segment['endPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-
-				overrides_segment = {
-					'plane': plane,
-					'startPoint': start,
-					'midPoint': mid,
-					'endPoint': end,
-					'angleRadians': segment['angleRadians']
-				}
-				roof['outline']['segments'][i] = self.override_schema(segment, self.schema['revit']['floor_segment_curved'], overrides_segment)
-
-		properties = self.get_element_properties(roof)
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-		
-		roof['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		self.map_outline(roof)
+
+		self.inject_parameters('roof', roof, self.get_element_properties(roof))
 
-		roof = self.override_schema(roof, self.schema['revit']['roof'], overrides)
+		roof = self.override_schema(roof, self.plans['roof'], overrides)
 
-		return bos.recompose_base(roof)
+		return roof.target
 
 	def map_slab(self, speckle_object, **parameters):
 		"""
 		Remap slab > floor schema.
 		"""
-		bos = BaseObjectSerializer()
-		floor = bos.traverse_base(speckle_object)[1]
+		floor = View.of(speckle_object)
 
 		general = self.get_general_parameters(floor)
-		top_offset = general.get(LOC['general_parameters'][self.parameters['loc']], 0) if general else 0  # revit uses top elevation
+		top_offset = general.get(self.keys['general_parameters'], 0) if general else 0  # revit uses top elevation
 		body = self.get_material_body(floor)
 
 		material = floor['structure']
@@ -648,79 +1054,13 @@ class TranslatorArchicad2Revit(Translator):
 			}
 		}
 
-		# note: there is an issue with curved slabs,
-		# unit convertion doesn't work for some reason, so we have to redefine this segment
-		for i in range(0, len(floor['outline']['segments'])-1):
-			if 'plane' in floor['outline']['segments'][i]:
-				segment = floor['outline']['segments'][i]
-				# redefine plane & coordinates
-				planeObj = Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3])
-				plane = BaseObjectSerializer().traverse_base(planeObj)[1]
-				start = self.add_point(
-					segment['startPoint']['x']*1000,
-					segment['startPoint']['y']*1000,
-					segment['startPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-				mid = self.add_point(
-					segment['midPoint']['x']*1000,
-					segment['midPoint']['y']*1000,
-					segment['midPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-				end = self.add_point(
-					segment['endPoint']['x']*1000,
-					segment['endPoint']['y']*1000,
-					segment['endPoint']['z']*1000,
-					units='mm',
-					traverse=True)
-
-				overrides_segment = {
-					'plane': plane,
-					'startPoint': start,
-					'midPoint': mid,
-					'endPoint': end,
-					'angleRadians': segment['angleRadians']
-				}
-				floor['outline']['segments'][i] = self.override_schema(segment, self.schema['revit']['floor_segment_curved'], overrides_segment)
-
-		floor = self.override_schema(floor, self.schema['revit']['floor'], overrides)
-
-		# # process sub elements
-		# if floor.get('elements', None):
-		# 	for e in range (0, len(floor['elements'])):
-		# 		element = floor['elements'][e]
-		# 		element_type = element['elementType'].lower()
-		# 		# if element_type == 'отвір': element_type = 'opening'
-		# 		if element_type in self.categories:
-		# 			shaft = self.map_opening(
-		# 				speckle_object = floor['elements'][e],
-		# 				host = floor['elementType'].lower(),
-		# 				host_level = floor['level'],
-		# 				host_thickness = floor['thickness'],
-		# 				host_top_offset = top_offset
-		# 			)
-		# 			floor['elements'][e] = shaft
-
-		properties = self.get_element_properties(floor)
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-		
-		floor['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		self.map_outline(floor)
+
+		floor = self.override_schema(floor, self.plans['floor'], overrides)
+
+		self.inject_parameters('slab', floor, self.get_element_properties(floor))
 
-		return bos.recompose_base(floor)
+		return floor.target
 
 	# TODO !
 	def map_stair(self, speckle_object, **parameters):
@@ -735,7 +1075,7 @@ class TranslatorArchicad2Revit(Translator):
 		"""
 		bos = BaseObjectSerializer()
 
-		level = bos.read_json(json.dumps (self.schema['revit']['level'], indent = 4))
+		level = bos.read_json(json.dumps (thaw(self.schema['revit']['level']), indent = 4))
 		level.id = story['id']
 		level.name = story['name']
 		# level.name = story.get('name', f"{story['index']} level on {story['elevation'] * 1000}")
@@ -744,6 +1084,90 @@ class TranslatorArchicad2Revit(Translator):
 
 		return level
 
+	# reference line locations: revit WALL_KEY_REF_PARAM value & the direction of the baseline offset
+	REFERENCE_LINES = {
+		'Center': (0, 1),		# Wall Centerline
+		'Core Center': (1, 1),	# Core Centerline
+		'Outside': (2, -1),		# Finish Face: Exterior
+		'Inside': (3, -1),		# Finish Face: Interior
+		'Core Outside': (4, 1),	# Core Face: Exterior
+		'Core Inside': (5, -1)	# Core Face: Inside
+	}
+
+	def get_wall_arguments(self, wall):
+		"""
+		Retrieves the inputs of the baseline correction for the given wall.
+		"""
+		wall = View.of(wall)
+		return (
+			wall['baseLine']['start']['x'],
+			wall['baseLine']['start']['y'],
+			wall['baseLine']['end']['x'],
+			wall['baseLine']['end']['y'],
+			wall['thickness'] / 2,
+			wall['offsetFromOutside'] if wall['offsetFromOutside'] else 0,
+			-1 if wall['flipped'] == True else 1,
+			wall['arcAngle'],
+			wall['baseLine'].get('length'),
+			self.REFERENCE_LINES[wall['referenceLineLocation']][1]
+		)
+
+	def get_wall_baseline(self, sx, sy, ex, ey, fix, out, flip, angle, chord, bdir):
+		"""
+		Calculates the corrected baseline of a single wall, see map_wall.
+		Returns start & end points with the direction for straight walls, start, mid & end points for curved ones.
+		"""
+		# straight walls
+		if not angle:
+			direction = self.get_vector_direction({'start': {'x': sx, 'y': sy }, 'end': {'x': ex, 'y': ey}})
+			off_x = (out - fix) * direction['y'] * flip * -1
+			off_y = (out - fix) * direction['x'] * flip
+			return {
+				'start': (sx + off_x, sy + off_y),
+				'end': (ex + off_x, ey + off_y),
+				'direction': (direction['x'], direction['y'])
+			}
+
+		# curved walls
+		t = fix
+		# chord midpoint
+		dx = (sx + ex) / 2
+		dy = (sy + ey) / 2
+
+		# radius to origin circle
+		radius = chord / (2 * math.sin(angle/2))
+
+		# angles, bisector chord normale
+		# vertical and horizontal chords are the limits of the general case
+		if ex == sx:
+			slope_angle = math.copysign(0.0, sy - ey)
+		elif ey == sy:
+			slope_angle = math.pi/2
+		else:
+			slope = (ey - sy) / (ex - sx)
+			slope_angle = math.atan(-1/slope)
+		start_angle = (math.pi/2-angle/2) - (math.pi/2-slope_angle)
+		end_angle = math.pi - (math.pi/2-angle/2) - (math.pi/2-slope_angle)
+
+		# chord midpoint
+		hypo = math.sqrt(radius**2 - (chord/2)**2)
+
+		# direction vectors
+		mvx = -int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# mid
+		svx =  int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# start
+		evx =  int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# end
+
+		# midpoint
+		mx = dx + (radius - hypo) * math.cos(slope_angle) * mvx
+		my = dy + (radius - hypo) * math.sin(slope_angle) * mvx
+
+		# updated coordinates
+		return {
+			'start': (sx + (t * math.cos(start_angle) * svx * bdir), sy + (t * math.sin(start_angle) * svx * bdir)),
+			'mid': (mx + (t * math.cos(slope_angle) * -mvx * bdir), my + (t * math.sin(slope_angle) * -mvx * bdir)),
+			'end': (ex + (t * math.cos(end_angle) * evx * bdir), ey + (t * math.sin(end_angle) * evx * bdir))
+		}
+
 	def map_wall(self, speckle_object, **parameters):
 		"""
 		Remap wall schema.
@@ -758,22 +1182,11 @@ class TranslatorArchicad2Revit(Translator):
 		For curved walls we have to calculate midpoint according to saved start/stop point and then offset
 		all the trio by the chord normal, according to the baseline position.
 		"""
-		bos = BaseObjectSerializer()
-		wall = bos.traverse_base(speckle_object)[1]
+		wall = View.of(speckle_object)
 
 		# retrieve top level linkage
 		if not wall.get('topLevel'):
-			top_level = self.get_top_link(wall, traverse=True)
-
-		# ref line locations & ndir
-		baseline = {
-			'Center': (0, 1),		# Wall Centerline
-			'Core Center': (1, 1),	# Core Centerline
-			'Outside': (2, -1),		# Finish Face: Exterior
-			'Inside': (3, -1),		# Finish Face: Interior
-			'Core Outside': (4, 1),	# Core Face: Exterior
-			'Core Inside': (5, -1)	# Core Face: Inside
-		}
+			top_level = self.get_top_link(wall)
 
 		material = wall['structure']
 		if wall['structure'] == 'Basic':
@@ -784,14 +1197,10 @@ class TranslatorArchicad2Revit(Translator):
 			material = wall['profileName']
 
 		# ref line coordinates
-		sx = wall['baseLine']['start']['x']
-		sy = wall['baseLine']['start']['y']
 		sz = wall['baseLine']['start']['z']
-		ex = wall['baseLine']['end']['x']
-		ey = wall['baseLine']['end']['y']
 
-		fix = wall['thickness'] / 2
-		out = wall['offsetFromOutside'] if wall['offsetFromOutside'] else 0
+		# corrected baseline
+		geometry = self.get_wall_baseline(*self.get_wall_arguments(wall))
 
 		overrides = {
 			'type': str(material) + ' (' + str(wall['thickness']) + ') -' + str(wall['layer']) + ')',
@@ -799,7 +1208,7 @@ class TranslatorArchicad2Revit(Translator):
 			'topOffset': wall['topOffset'],
 			'parameters': {
 				'WALL_KEY_REF_PARAM': {
-					'value': baseline[wall['referenceLineLocation']][0]
+					'value': self.REFERENCE_LINES[wall['referenceLineLocation']][0]
 				}
 			}
 		}
@@ -807,64 +1216,20 @@ class TranslatorArchicad2Revit(Translator):
 		# straight walls
 		if not wall['arcAngle']:
 
-			flip = -1 if wall['flipped'] == True else 1
-			direction = self.get_vector_direction({'start': {'x': sx, 'y': sy }, 'end': {'x': ex, 'y': ey}})
-			off_x = (out - fix) * direction['y'] * flip * -1
-			off_y = (out - fix) * direction['x'] * flip
-
-			wall_schema = self.schema['revit']['wall']
-			wall_schema['baseLine'] = self.schema['revit']['wall_base']
 			overrides['baseLine'] = {
-				'start': {'x': sx + off_x, 'y': sy + off_y},
-				'end': {'x': ex + off_x, 'y': ey  + off_y}
+				'start': {'x': geometry['start'][0], 'y': geometry['start'][1]},
+				'end': {'x': geometry['end'][0], 'y': geometry['end'][1]}
 			}
-			wall = self.override_schema(wall, wall_schema, overrides)
+			wall = self.override_schema(wall, self.plans['wall_straight'], overrides)
 
 		# curved walls
 		elif wall['arcAngle']:
 
-			t = fix
-			# chord midpoint
-			dx = (sx + ex) / 2
-			dy = (sy + ey) / 2
-
-			# radius to origin circle
-			chord = wall['baseLine']['length']
-			radius = chord / (2 * math.sin(wall['arcAngle']/2))
-
-			# angles
-			slope = (ey - sy) / (ex - sx)
-			slope_angle = math.atan(-1/slope) # bisector chord normale
-			start_angle = (math.pi/2-wall['arcAngle']/2) - (math.pi/2-slope_angle)
-			end_angle = math.pi - (math.pi/2-wall['arcAngle']/2) - (math.pi/2-slope_angle)
-
-			# chord midpoint
-			hypo = math.sqrt(radius**2 - (chord/2)**2)
-
-			# direction vectors
-			mvx = -int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# mid
-			svx =  int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# start
-			evx =  int(math.copysign(1, dx-sx)) * int(math.copysign(1, slope_angle))	# end
-			
-			# midpoint
-			mx = dx + (radius - hypo) * math.cos(slope_angle) * mvx
-			my = dy + (radius - hypo) * math.sin(slope_angle) * mvx
-
-			# updated coordinates
-			bdir = baseline[wall['referenceLineLocation']][1]
-			mdx = mx + (t * math.cos(slope_angle) * -mvx * bdir)
-			mdy = my + (t * math.sin(slope_angle) * -mvx * bdir)
-			sdx = sx + (t * math.cos(start_angle) * svx * bdir)
-			sdy = sy + (t * math.sin(start_angle) * svx * bdir)
-			edx = ex + (t * math.cos(end_angle) * evx * bdir)
-			edy = ey + (t * math.sin(end_angle) * evx * bdir)
-
 			# redefine plane & coordinates
-			planeObj = Plane.from_list([0,0,0,	0,0,1,	1,0,0,	0,1,0, 3])
-			plane = BaseObjectSerializer().traverse_base(planeObj)[1]
-			start = self.add_point(sdx, sdy, sz, traverse=True)
-			mid = self.add_point(mdx, mdy, sz, traverse=True)
-			end = self.add_point(edx, edy, sz, traverse=True)
+			plane = self.PLANE_XY
+			start = self.add_point(geometry['start'][0], geometry['start'][1], sz)
+			mid = self.add_point(geometry['mid'][0], geometry['mid'][1], sz)
+			end = self.add_point(geometry['end'][0], geometry['end'][1], sz)
 
 			overrides['baseLine'] = {
 				'plane': plane,
@@ -874,66 +1239,30 @@ class TranslatorArchicad2Revit(Translator):
 				'angleRadians': wall['arcAngle']
 			}
 
-			wall_schema = self.schema['revit']['wall']
-			wall_schema['baseLine'] = self.schema['revit']['wall_base_curved']
-			wall = self.override_schema(wall, wall_schema, overrides)
-
-		# map sub elements
-		if wall.get('elements'):
-			for e in range (0, len(wall['elements'])):
-				element = wall['elements'][e]
-				element_type = element['elementType'].lower()
-				# element_type = LOC[element_type][self.parameters['loc']]
-				# print (element_type)
-				if element_type == 'двері': element_type = 'door'
-				if element_type == 'вікно': element_type = 'window'
-				if element_type == 'отвір': element_type = 'opening'
-				if element_type in self.categories:
-					sub_mapper = getattr(self, 'map_' + element_type)
-					sub = sub_mapper(
-						speckle_object = wall['elements'][e],
-						host = wall['elementType'].lower(),
-						points = {'sx': sx, 'sy': sy, 'sz': sz, 'dx': direction['x'], 'dy': direction['y']}
-					)
-					sub['level'] = wall['level']
-					wall['elements'][e] = sub
-				else:
-					self.log.warning(f"Translation skipped for category: $y(\"{element['elementType']}\")")
-
-		properties = self.get_element_properties(wall)
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-		
-		wall['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+			wall = self.override_schema(wall, self.plans['wall_curved'], overrides)
+
+		self.inject_parameters('wall', wall, self.get_element_properties(wall))
 
-		return bos.recompose_base(wall)
+		return wall.target
 
 	# TODO !
 	def map_wido(self, speckle_object, **parameters):
 		"""
 		Remap door and window schema.
 		"""
-		wido = speckle_object
+		wido = View.of(speckle_object)
 		properties = self.get_element_properties(wido)
 		general = self.get_general_parameters(wido)
-		points = parameters['points']
+		points = parameters.get('points')
+		if not points or points['dx'] is None:
+			# not hosted by a wall, or nowhere to put it along the host, left as it is
+			self.diagnostics.add(wido['elementType'], Diagnostics.NO_HOST_DIRECTION, wido['id'])
+			return speckle_object
 
 		group = properties.get('ЗАПОВНЕННЯ ВІКОННИХ ОТВОРІВ', {})
 		ori = group.get('Орієнтація віконного заповнення')
 
-		wido_id = general.get(LOC['element_id'][self.parameters['loc']], '')
+		wido_id = general.get(self.keys['element_id'], '')
 		typo = f"{wido['libraryPart']} {wido['width']}x{wido['height']} M:{wido['revealDepthFromSide']} O: {ori} - Id: {str(wido_id)}"
 
 		overrides = {
@@ -961,27 +1290,11 @@ class TranslatorArchicad2Revit(Translator):
 		if wido['elementType'] == 'Вікно': element_type = 'window'
 		else: element_type = 'window'
 
-		wido = self.override_schema(wido, self.schema['revit'][element_type.lower()], overrides)
-
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-
-		# wido['parameters'] = {}
-		wido['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		wido = self.override_schema(wido, self.plans[element_type.lower()], overrides)
 
-		return wido
+		self.inject_parameters('wido', wido, properties)
+
+		return wido.target
 
 	# TODO !
 	def map_window(self, speckle_object, **parameters):
@@ -995,44 +1308,23 @@ class TranslatorArchicad2Revit(Translator):
 		"""
 		Remap zone > room schema.
 		"""
-		bos = BaseObjectSerializer()
-		zone = bos.traverse_base(speckle_object)[1]
+		zone = View.of(speckle_object)
 
 		properties = self.get_element_properties(zone)
-		general = properties.get(LOC['general_parameters'][self.parameters['loc']], {})
+		general = properties.get(self.keys['general_parameters'], {})
 		group = properties.get('ZONESUM', {})
 		zones = properties.get('ЗОНИ', {})
 
 		# area = general.get('Area', None)
 		# category = group.get('spk_prop_category', 'n/a')
 
-		# new
-		gid = zones.get('spk_prop_gid', None)
-		location = group.get('ЛОКАЦИЯ Квартира', None)
+		# new, the rest of the zone properties is mapped by the parameter templates
 		number = group.get('spk_prop_num', None)
 		function = zones.get('spk_prop_func', None)
-		coef = zones.get('spk_prop_coef', None)
-		prop_flat = zones.get('spk_prop_flat', None)
-		prop_total = zones.get('spk_prop_total', None)
-		prop_living = zones.get('spk_prop_living', None)
-		typo = zones.get('spk_prop_type', None)
-
-		group_b = properties.get('ІНФОРМАЦІЯ ПРО БУДИНОК', {})
-		div = group_b.get('RLL-Частина будівлі', None)
-
-		for segment in zone['outline']['segments']:
-			obs = BaseObjectSerializer()
 
-			boundary = obs.traverse_base(Base())[1]
-			boundary = {}
-			boundary['level'] = zone['level']
-			boundary['units'] = 'm'
-			boundary['baseCurve'] = segment
-			boundary['speckle_type'] = 'Objects.BuiltElements.Revit.Curve.RoomBoundaryLine'
-			boundaryObj = obs.recompose_base(boundary)
-
-			if self.object['elements'][self.collections['boundaries']]:
-				self.object['elements'][self.collections['boundaries']]['elements'].append(boundaryObj)
+		if self.object['elements'][self.collections['boundaries']]:
+			with PROFILER.stage('boundaries', 1):
+				self.object['elements'][self.collections['boundaries']]['elements'].extend(self.get_boundaries(zone))
 
 		overrides = {
 			'type': 'Room',
@@ -1049,113 +1341,8 @@ class TranslatorArchicad2Revit(Translator):
 				}
 			}
 		}
-		room = self.override_schema(zone, self.schema['revit']['room'], overrides)
-
-		room['parameters']['MRT_Division'] = {
-			"name": "MRT_Division",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "MRT_Division",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": div
-		}
+		room = self.override_schema(zone, self.plans['room'], overrides)
 
-		room['parameters']['RLL_Позиція_Кв'] = {
-			"name": "RLL_Позиція_Кв",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "RLL_Позиція_Кв",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": location
-		}
-
-		room['parameters']['ADSK_Номер квартиры'] = {
-			"name": "ADSK_Номер квартиры",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Номер квартиры",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": gid
-		}
-		room['parameters']['ADSK_Коэффициент площади'] = {
-			"name": "ADSK_Коэффициент площади",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Коэффициент площади",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": coef
-		}
-		room['parameters']['ADSK_Площадь квартиры'] = {
-			"name": "ADSK_Площадь квартиры",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Площадь квартиры",
-			'applicationUnit': 'autodesk.unit.unit:squareMeters-1.0.1',
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': 'm²',
-			"value": prop_flat
-		}
-		room['parameters']['ADSK_Площадь квартиры общая'] = {
-			"name": "ADSK_Площадь квартиры общая",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Площадь квартиры общая",
-			'applicationUnit': 'autodesk.unit.unit:squareMeters-1.0.1',
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': 'm²',
-			"value": prop_total
-		}		
-		room['parameters']['ADSK_Площадь квартиры жилая'] = {
-			"name": "ADSK_Площадь квартиры жилая",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Площадь квартиры жилая",
-			'applicationUnit': 'autodesk.unit.unit:squareMeters-1.0.1',
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': 'm²',
-			"value": prop_living
-		}
-		room['parameters']['ADSK_Тип помещения'] = {
-			"name": "ADSK_Тип помещения",
-			"speckle_type": "Objects.BuiltElements.Revit.Parameter",
-			"applicationId": None,
-			"applicationInternalName": "ADSK_Тип помещения",
-			"applicationUnit": None,
-			"applicationUnitType": None,
-			"isReadOnly": False,
-			"isShared": False,
-			"isTypeParameter": False,
-			'units': None,
-			"value": typo
-		}
+		self.inject_parameters('zone', room, properties)
 
-		return bos.recompose_base(room)
\ No newline at end of file
+		return room.target
\ No newline at end of file
@@ -0,0 +1,165 @@
+import copy
+import functools
+
+from specklepy.objects.base import Base, REMOVE_FROM_DIR
+
+@functools.lru_cache(maxsize=None)
+def members(cls):
+	"""
+	Class level member names, as seen by BaseObjectSerializer (typed props, properties etc).
+	"""
+	return frozenset(
+		name for name in set(dir(cls)) - REMOVE_FROM_DIR
+		if not name.startswith('_') and not callable(getattr(cls, name, None))
+	)
+
+def unwrap(value, owned=None):
+	"""
+	Returns the raw value for the given view. Dicts with the speckle_type are turned into
+	the (registered) Base objects, the same way BaseObjectSerializer.recompose_base does.
+	"""
+	if isinstance(value, View):
+		return value.target
+	if isinstance(value, dict):
+		if 'speckle_type' in value:
+			speckle_type = value['speckle_type']
+			cls = Base.get_registered_type(speckle_type)
+			result = cls() if cls else Base.of_type(speckle_type)
+			for key, item in value.items():
+				setattr(result, key, unwrap(item, owned))
+		else:
+			result = {key: unwrap(item, owned) for key, item in value.items()}
+	elif isinstance(value, list):
+		result = [unwrap(item, owned) for item in value]
+	else:
+		return value
+	if owned is not None:
+		owned[id(result)] = result
+	return result
+
+def wrap(value, parent=None, key=None):
+	"""
+	Wraps the value into the corresponding view, primitives are returned as is.
+	"""
+	if isinstance(value, Base):
+		return BaseView(value, parent, key)
+	if isinstance(value, list):
+		return ListView(value, parent, key)
+	if isinstance(value, dict):
+		return DictView(value, parent, key)
+	return value
+
+class View():
+	"""
+	Copy-on-write view over the speckle object tree.
+
+	Mimics the dict structure of BaseObjectSerializer.traverse_base, so the mappers could edit
+	objects in place instead of the full serialization round trip. Received sub-objects might be
+	shared between elements (receive deduplicates them by id), so any object is copied before
+	the first write and the copy is put back into the parent.
+	"""
+
+	def __init__(self, target, parent=None, key=None, owned=None):
+		self.target = target
+		self.parent = parent
+		self.key = key
+		# objects created while mapping, they are safe to be modified
+		self.owned = parent.owned if parent is not None else owned if owned is not None else {}
+
+	@staticmethod
+	def of(value):
+		return value if isinstance(value, View) else wrap(value)
+
+	def own(self):
+		if id(self.target) not in self.owned:
+			self.replace(copy.copy(self.target))
+		return self.target
+
+	def replace(self, target):
+		self.target = target
+		self.owned[id(target)] = target
+		if self.parent is not None:
+			self.parent.put(self.key, target)
+
+	def get(self, key, default=None):
+		return self[key] if key in self else default
+
+	def setdefault(self, key, default=None):
+		if key not in self:
+			self[key] = default
+		return self[key]
+
+class BaseView(View):
+
+	def __contains__(self, key):
+		return key in self.target.__dict__ or key in members(type(self.target))
+
+	def __getitem__(self, key):
+		try:
+			value = self.target.__dict__[key]
+		except KeyError:
+			if key not in self:
+				raise
+			value = getattr(self.target, key)
+		return wrap(value, self, key)
+
+	def __setitem__(self, key, value):
+		value = unwrap(value, self.owned)
+		if key == 'speckle_type':
+			self.retype(value)
+		else:
+			setattr(self.own(), key, value)
+
+	def put(self, key, value):
+		setattr(self.own(), key, value)
+
+	def retype(self, speckle_type):
+		"""
+		Changes the speckle_type, the object is recreated if it is registered for another class.
+		"""
+		cls = Base.get_registered_type(speckle_type) or Base
+		if type(self.target) is not cls:
+			target = cls()
+			for name in self.target.get_serializable_attributes():
+				setattr(target, name, getattr(self.target, name, None))
+			self.replace(target)
+		if cls is Base:
+			self.own().__dict__['speckle_type'] = speckle_type
+
+class DictView(View):
+
+	def __contains__(self, key):
+		return key in self.target
+
+	def __getitem__(self, key):
+		return wrap(self.target[key], self, key)
+
+	def __setitem__(self, key, value):
+		self.own()[key] = unwrap(value, self.owned)
+
+	def put(self, key, value):
+		self.own()[key] = value
+
+	def items(self):
+		return [(key, self[key]) for key in self.target]
+
+class ListView(View):
+
+	def __len__(self):
+		return len(self.target)
+
+	def __iter__(self):
+		for i in range(len(self.target)):
+			yield self[i]
+
+	def __getitem__(self, i):
+		return wrap(self.target[i], self, i)
+
+	def __setitem__(self, i, value):
+		self.own()[i] = unwrap(value, self.owned)
+
+	def put(self, i, value):
+		self.own()[i] = value
+
+	def append(self, value):
+		self.own().append(unwrap(value, self.owned))
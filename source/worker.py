@@ -0,0 +1,158 @@
+import json
+import os
+import time
+import traceback
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .logging import LogWrapper
+
+class JobRunner():
+	"""
+	Runs translation jobs from a spool directory within one long-running process, so the client
+	with its sessions, the schemas and the caches are set up once rather than per commit.
+
+	A job is a json object of the handler arguments, e.g.
+	{"stream": "aeb487f0e6", "commit": "12bb209f52", "translator": "Archicad2Revit", "loc": "ua"},
+	put into the spool directory as a .json file. It is to be written elsewhere and moved in,
+	so it is never read half written. While handled, the job is kept in running/ as pid-name.json,
+	pid of the runner process, then it goes to done/ or failed/ along with its result (or error)
+	and timings. Jobs left in running/ by a runner process which is gone are taken again on start,
+	the runners sharing a spool are expected to be on the same host.
+	"""
+
+	def __init__(self, spool, handler, concurrency=2, poll=1.0):
+		self.log = LogWrapper.get_logger('app.worker')
+		self.spool = spool
+		self.handler = handler
+		self.concurrency = concurrency
+		self.poll = poll
+		self.directories = {name: os.path.join(spool, name) for name in ('running', 'done', 'failed')}
+		for directory in self.directories.values():
+			os.makedirs(directory, exist_ok=True)
+		self.requeue()
+
+	@staticmethod
+	def alive(pid):
+		"""
+		Whether the process is still running, on this host.
+		"""
+		if os.name == 'nt':
+			# os.kill would terminate it
+			import ctypes
+			kernel32 = ctypes.windll.kernel32
+			handle = kernel32.OpenProcess(0x1000, False, pid)	# PROCESS_QUERY_LIMITED_INFORMATION
+			if not handle:
+				return False
+			code = ctypes.c_ulong()
+			kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+			kernel32.CloseHandle(handle)
+			return code.value == 259	# STILL_ACTIVE
+		try:
+			os.kill(pid, 0)
+		except ProcessLookupError:
+			return False
+		except PermissionError:
+			return True
+		return True
+
+	def requeue(self):
+		"""
+		Moves the jobs of the runners which are gone from running/ back into the spool.
+		"""
+		for entry in os.listdir(self.directories['running']):
+			pid, _, name = entry.partition('-')
+			if not pid.isdigit() or not name:
+				# no runner recorded
+				name = entry
+			elif self.alive(int(pid)):
+				continue
+			try:
+				os.replace(os.path.join(self.directories['running'], entry), os.path.join(self.spool, name))
+			except FileNotFoundError:
+				# requeued by another runner meanwhile
+				continue
+			self.log.info('Job $y("%s") requeued', name)
+
+	def pending(self):
+		"""
+		Names of the jobs waiting in the spool, the oldest first.
+		"""
+		jobs = []
+		for name in os.listdir(self.spool):
+			if not name.endswith('.json'):
+				continue
+			try:
+				jobs.append((os.stat(os.path.join(self.spool, name)).st_mtime_ns, name))
+			except FileNotFoundError:
+				# claimed by another runner meanwhile
+				continue
+		return [name for _, name in sorted(jobs)]
+
+	def claim(self, name):
+		"""
+		Moves the job to running/, returns its path there or None if another runner took it first.
+		"""
+		path = os.path.join(self.directories['running'], f'{os.getpid()}-{name}')
+		try:
+			os.replace(os.path.join(self.spool, name), path)
+		except FileNotFoundError:
+			return None
+		return path
+
+	def run(self, name, path, queued):
+		started = time.time()
+		ts = time.perf_counter()
+		outcome = {'queued': queued, 'started': started}
+		try:
+			with open(path, encoding='utf-8') as file:
+				job = json.load(file)
+			outcome['job'] = job
+			self.log.info('Job $y("%s") started', name)
+			outcome['result'] = self.handler(job)
+			status = 'done'
+		except Exception as e:
+			outcome['error'] = ''.join(traceback.format_exception(e))
+			status = 'failed'
+		outcome['seconds'] = time.perf_counter() - ts
+		outcome['waited'] = started - queued
+
+		with open(os.path.join(self.directories[status], name), 'w', encoding='utf-8') as file:
+			json.dump(outcome, file, indent=1, default=str)
+		os.remove(path)
+		if status == 'done':
+			self.log.info('Job $y("%s") done in $m(%.2f) sec, waited $m(%.2f) sec', name, outcome['seconds'], outcome['waited'])
+		else:
+			self.log.error('Job $y("%s") failed in $m(%.2f) sec: %s', name, outcome['seconds'], outcome['error'].strip().splitlines()[-1])
+		return status
+
+	def serve(self, once=False):
+		"""
+		Takes the jobs as they come, at most concurrency of them at once.
+		With once, returns when the spool is empty, otherwise runs until interrupted.
+		Returns the number of the jobs done and failed.
+		"""
+		self.log.info('Serving jobs from $y("%s"), $m(%d) at once', self.spool, self.concurrency)
+		counts = {'done': 0, 'failed': 0}
+		tasks = set()
+		with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='job') as executor:
+			try:
+				while True:
+					for name in self.pending()[:self.concurrency - len(tasks)]:
+						path = self.claim(name)
+						if path:
+							queued = os.stat(path).st_mtime
+							tasks.add(executor.submit(self.run, name, path, queued))
+					if once and not tasks and not self.pending():
+						break
+					if tasks:
+						done, tasks = wait(tasks, timeout=self.poll, return_when=FIRST_COMPLETED)
+						for task in done:
+							counts[task.result()] += 1
+					else:
+						time.sleep(self.poll)
+			except KeyboardInterrupt:
+				self.log.info('Stopping, waiting for $m(%d) running jobs', len(tasks))
+				for task in tasks:
+					counts[task.result()] += 1
+		return counts
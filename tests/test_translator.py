@@ -0,0 +1,89 @@
+import logging
+import math
+
+import pytest
+from specklepy.objects.other import Collection
+
+from benchmarks.synthetic import SyntheticCommit
+from source import Diagnostics, TranslatorFactory
+
+logging.disable(logging.WARNING)
+
+def translate(commit, synthetic, **parameters):
+	translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=commit, loc=synthetic.loc, **parameters)
+	translator.map()
+	return translator
+
+def issues(translator, kind):
+	return {issue['category']: issue['count'] for issue in translator.diagnostics.report() if issue['kind'] == kind}
+
+def test_unhosted_door_is_left_as_is():
+	synthetic = SyntheticCommit(count=4, seed=1)
+	commit = synthetic.generate()
+	door = synthetic.wido(synthetic.levels[0], 5.0)
+	collection = Collection(name='Fenestration', collectionType='Element Type', elements=[door])
+	commit.elements.append(collection)
+
+	translator = translate(commit, synthetic)
+
+	assert collection.elements[0] is door
+	assert issues(translator, Diagnostics.NO_HOST_DIRECTION) == {door['elementType']: 1}
+
+def test_opening_nested_in_slab_is_left_as_is():
+	synthetic = SyntheticCommit(count=4, seed=1)
+	commit = synthetic.generate()
+	slabs = next(collection for collection in commit.elements if collection.name == 'Slab')
+	window = synthetic.wido(synthetic.levels[0], 5.0)
+	slabs.elements[0]['elements'] = [window]
+
+	translator = translate(commit, synthetic)
+
+	# put on the level of its host, but not mapped
+	nested = slabs.elements[0]['elements'][0]
+	assert nested.id == window.id and nested.speckle_type == window.speckle_type
+	assert issues(translator, Diagnostics.NO_HOST_DIRECTION) == {window['elementType']: 1}
+
+def test_previous_translation_made_differently_is_not_reused():
+	synthetic = SyntheticCommit(count=4, seed=1)
+	source, target = synthetic.generate(), SyntheticCommit(count=4, seed=1).generate()
+	translate(target, synthetic)
+
+	for loc, active in (('ua', True), ('en', False)):
+		commit = SyntheticCommit(count=4, seed=1).generate()
+		translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=commit, loc=loc, previous=(source, target))
+		assert translator.delta.active == active
+
+@pytest.mark.parametrize('bdir', (1, -1))
+@pytest.mark.parametrize('sx, sy, ex, ey', (
+	(0.0, 0.0, 0.0, -4.0),	# vertical chords
+	(0.0, 0.0, 0.0, 4.0),
+	(0.0, 0.0, 4.0, 0.0),	# horizontal chords
+	(0.0, 0.0, -4.0, 0.0),
+))
+def test_degenerate_chords_of_curved_walls_match_nearby_ones(sx, sy, ex, ey, bdir):
+	synthetic = SyntheticCommit(count=4, seed=1)
+	translator = TranslatorFactory.get('Archicad2Revit', client=None, speckle_object=synthetic.generate(), loc=synthetic.loc)
+	angle, chord = math.pi / 2, math.hypot(ex - sx, ey - sy)
+
+	baseline = translator.get_wall_baseline(sx, sy, ex, ey, 0.1, 0, 1, angle, chord, bdir)
+	# the end point moved off the axis to either side
+	for shift in (1e-9, -1e-9):
+		nx, ny = (ex + shift, ey) if ex == sx else (ex, ey + shift)
+		nearby = translator.get_wall_baseline(sx, sy, nx, ny, 0.1, 0, 1, angle, chord, bdir)
+		for point in ('start', 'mid', 'end'):
+			assert baseline[point] == pytest.approx(nearby[point], abs=1e-6)
+
+def test_last_curved_segment_of_outline_is_rebuilt():
+	synthetic = SyntheticCommit(count=4, seed=1)
+	commit = synthetic.generate()
+	slabs = next(collection for collection in commit.elements if collection.name == 'Slab')
+	z = synthetic.levels[0].elevation
+	corners = [(0, 0), (4, 0), (4, 4), (0, 4)]
+	# straight segments, the closing one curved
+	slabs.elements[0]['outline'] = synthetic.polycurve([synthetic.line(corners[i], corners[i + 1], z) for i in range(3)] + [synthetic.arc(corners[3], corners[0], z)])
+
+	translate(commit, synthetic)
+
+	last = slabs.elements[0]['outline']['segments'][-1]
+	assert last['startPoint'].units == 'mm'
+	assert (last['startPoint']['x'], last['startPoint']['y']) == (0, 4000)